@@ -5,42 +5,69 @@ Authentication Endpoints
 
 from datetime import timedelta
 from typing import Any
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
 from app.core.security import create_access_token, create_refresh_token, verify_token
-from app.core.dependencies import CurrentUser, get_db
-from app.services.user_service import UserService, get_user_service
+from app.core.dependencies import CurrentUser
+from app.core.user_cache import invalidate_user_cache
+from app.services.user_service import AuthUser, UserService, get_user_service
 from app.models.user_schemas import (
     LoginRequest, TokenResponse, TokenRefreshRequest, RegisterRequest, 
-    RegisterResponse, UserResponse, PasswordChange
+    RegisterResponse, UserResponse, PasswordChange, dump_json
 )
 
 router = APIRouter()
 
+# 토큰 만료 시간 - 설정은 불변이므로 import 시 한 번만 계산
+ACCESS_TOKEN_EXPIRES = timedelta(minutes=settings.JWT_ACCESS_TOKEN_EXPIRE_MINUTES)
+REFRESH_TOKEN_EXPIRES = timedelta(days=settings.JWT_REFRESH_TOKEN_EXPIRE_DAYS)
+ACCESS_TOKEN_EXPIRES_IN = int(ACCESS_TOKEN_EXPIRES.total_seconds())
+
+
+def _issue_token_pair(user: AuthUser) -> TokenResponse:
+    """사용자에 대한 액세스/리프레시 토큰 쌍 발급"""
+    access_token = create_access_token(
+        data={"sub": str(user.id), "email": user.email},
+        expires_delta=ACCESS_TOKEN_EXPIRES
+    )
+    refresh_token = create_refresh_token(
+        data={"sub": str(user.id)},
+        expires_delta=REFRESH_TOKEN_EXPIRES
+    )
+    
+    return TokenResponse(
+        access_token=access_token,
+        refresh_token=refresh_token,
+        token_type="bearer",
+        expires_in=ACCESS_TOKEN_EXPIRES_IN
+    )
+
 
 @router.post("/register", response_model=RegisterResponse, status_code=status.HTTP_201_CREATED)
 async def register(
     user_data: RegisterRequest,
-    db: AsyncSession = Depends(get_db)
+    user_service: UserService = Depends(get_user_service)
 ) -> Any:
     """
     회원가입
     
     새로운 사용자 계정을 생성합니다.
     """
-    user_service = get_user_service(db)
-    
     try:
         # 사용자 생성
         user = await user_service.create_user(user_data)
         
-        return RegisterResponse(
-            user=UserResponse.from_orm(user),
+        response = RegisterResponse(
+            user=UserResponse.model_validate(user),
             message="회원가입이 완료되었습니다. 이메일 인증을 진행해주세요."
         )
+        return Response(
+            content=dump_json(RegisterResponse, response),
+            status_code=status.HTTP_201_CREATED,
+            media_type="application/json"
+        )
         
     except ValueError as e:
         raise HTTPException(
@@ -57,15 +84,13 @@ async def register(
 @router.post("/login", response_model=TokenResponse)
 async def login(
     login_data: LoginRequest,
-    db: AsyncSession = Depends(get_db)
+    user_service: UserService = Depends(get_user_service)
 ) -> Any:
     """
     로그인
     
     이메일과 패스워드로 로그인하여 JWT 토큰을 발급받습니다.
     """
-    user_service = get_user_service(db)
-    
     # 사용자 인증
     user = await user_service.authenticate_user(login_data.email, login_data.password)
     if not user:
@@ -75,45 +100,20 @@ async def login(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    if not user.is_active:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="비활성화된 계정입니다"
-        )
-    
     # JWT 토큰 생성
-    access_token_expires = timedelta(minutes=settings.JWT_ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={"sub": str(user.id), "email": user.email},
-        expires_delta=access_token_expires
-    )
-    
-    refresh_token_expires = timedelta(days=settings.JWT_REFRESH_TOKEN_EXPIRE_DAYS)
-    refresh_token = create_refresh_token(
-        data={"sub": str(user.id)},
-        expires_delta=refresh_token_expires
-    )
-    
-    return TokenResponse(
-        access_token=access_token,
-        refresh_token=refresh_token,
-        token_type="bearer",
-        expires_in=settings.JWT_ACCESS_TOKEN_EXPIRE_MINUTES * 60
-    )
+    return _issue_token_pair(user)
 
 
 @router.post("/login/form", response_model=TokenResponse)
 async def login_with_form(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: AsyncSession = Depends(get_db)
+    user_service: UserService = Depends(get_user_service)
 ) -> Any:
     """
     폼 데이터를 이용한 로그인 (OAuth2 호환)
     
     OpenAPI 문서의 "Authorize" 버튼에서 사용됩니다.
     """
-    user_service = get_user_service(db)
-    
     # 사용자 인증 (username을 email로 사용)
     user = await user_service.authenticate_user(form_data.username, form_data.password)
     if not user:
@@ -123,37 +123,14 @@ async def login_with_form(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    if not user.is_active:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="비활성화된 계정입니다"
-        )
-    
     # JWT 토큰 생성
-    access_token_expires = timedelta(minutes=settings.JWT_ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={"sub": str(user.id), "email": user.email},
-        expires_delta=access_token_expires
-    )
-    
-    refresh_token_expires = timedelta(days=settings.JWT_REFRESH_TOKEN_EXPIRE_DAYS)
-    refresh_token = create_refresh_token(
-        data={"sub": str(user.id)},
-        expires_delta=refresh_token_expires
-    )
-    
-    return TokenResponse(
-        access_token=access_token,
-        refresh_token=refresh_token,
-        token_type="bearer",
-        expires_in=settings.JWT_ACCESS_TOKEN_EXPIRE_MINUTES * 60
-    )
+    return _issue_token_pair(user)
 
 
 @router.post("/refresh", response_model=TokenResponse)
 async def refresh_token(
     refresh_data: TokenRefreshRequest,
-    db: AsyncSession = Depends(get_db)
+    user_service: UserService = Depends(get_user_service)
 ) -> Any:
     """
     토큰 갱신
@@ -178,8 +155,7 @@ async def refresh_token(
         )
     
     # 사용자 확인
-    user_service = get_user_service(db)
-    user = await user_service.get_user_by_id(user_id)
+    user = await user_service.get_user_by_id_for_auth(user_id)
     if not user or not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -188,24 +164,7 @@ async def refresh_token(
         )
     
     # 새로운 토큰 생성
-    access_token_expires = timedelta(minutes=settings.JWT_ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={"sub": str(user.id), "email": user.email},
-        expires_delta=access_token_expires
-    )
-    
-    refresh_token_expires = timedelta(days=settings.JWT_REFRESH_TOKEN_EXPIRE_DAYS)
-    new_refresh_token = create_refresh_token(
-        data={"sub": str(user.id)},
-        expires_delta=refresh_token_expires
-    )
-    
-    return TokenResponse(
-        access_token=access_token,
-        refresh_token=new_refresh_token,
-        token_type="bearer",
-        expires_in=settings.JWT_ACCESS_TOKEN_EXPIRE_MINUTES * 60
-    )
+    return _issue_token_pair(user)
 
 
 @router.get("/me", response_model=UserResponse)
@@ -217,22 +176,20 @@ async def get_current_user_info(
     
     JWT 토큰으로 인증된 현재 사용자의 정보를 반환합니다.
     """
-    return UserResponse.from_orm(current_user)
+    return Response(content=dump_json(UserResponse, current_user), media_type="application/json")
 
 
 @router.post("/change-password")
 async def change_password(
     password_data: PasswordChange,
     current_user: CurrentUser,
-    db: AsyncSession = Depends(get_db)
+    user_service: UserService = Depends(get_user_service)
 ) -> Any:
     """
     패스워드 변경
     
     현재 사용자의 패스워드를 변경합니다.
     """
-    user_service = get_user_service(db)
-    
     try:
         success = await user_service.update_password(
             current_user.id,
@@ -246,6 +203,7 @@ async def change_password(
                 detail="패스워드 변경에 실패했습니다"
             )
         
+        invalidate_user_cache(current_user.id)
         return {"message": "패스워드가 성공적으로 변경되었습니다"}
         
     except ValueError as e:
@@ -265,6 +223,7 @@ async def logout(
     현재는 클라이언트에서 토큰을 삭제하도록 안내합니다.
     향후 토큰 블랙리스트 기능을 추가할 수 있습니다.
     """
+    invalidate_user_cache(current_user.id)
     return {
         "message": "로그아웃되었습니다. 클라이언트에서 토큰을 삭제해주세요.",
         "user_id": str(current_user.id)
@@ -3,17 +3,26 @@ Real-time Communication Endpoints
 WebSocket 및 SSE를 통한 실시간 통신 엔드포인트 구현
 """
 
-import json
 import logging
 import asyncio
+import re
 import uuid
-from typing import Dict, Any, Optional
-from datetime import datetime
+from contextlib import suppress
+from typing import Dict, Any, Optional, Set, AsyncIterator
+from datetime import datetime, timezone
 
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect, HTTPException, Request
+import orjson
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, HTTPException
 from fastapi.responses import StreamingResponse
-from starlette.status import HTTP_404_NOT_FOUND
+from pydantic import BaseModel
+from pydantic_core import to_json
+from redis.asyncio import Redis
+from redis.asyncio.client import PubSub
+from redis.exceptions import RedisError
+from starlette.status import HTTP_404_NOT_FOUND, WS_1011_INTERNAL_ERROR, WS_1013_TRY_AGAIN_LATER
+from starlette.websockets import WebSocketState
 
+from app.core.config import settings
 from app.models.actions import (
     UserMessage, AIResponse, WebSocketMessage, ActionBlock,
     TextAction, MusicAction, ScheduleAction, ActionType
@@ -25,71 +34,411 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-# 간단한 연결 관리자 (실제 프로덕션에서는 Redis 등 사용)
+# orjson 직렬화 옵션 (datetime 은 pydantic-core 와 같은 "Z" 접미사 형식으로 인코딩)
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+
+# 자주 전송되는 제어 프레임은 고정 부분만 import 시 한 번 직렬화하고,
+# 전송 시 WebSocketMessage 봉투의 나머지 필드(timestamp, connection_id)를 이어 붙임
+TYPING_ON_PREFIX = orjson.dumps({
+    "type": "typing",
+    "data": {"is_typing": True, "message": "AI가 응답을 생성 중입니다..."}
+})[:-1]
+TYPING_OFF_PREFIX = orjson.dumps({
+    "type": "typing",
+    "data": {"is_typing": False, "message": "AI가 응답을 생성 중입니다..."}
+})[:-1]
+
+
+def typing_frame(prefix: bytes) -> bytes:
+    """
+    미리 직렬화한 타이핑 프레임에 봉투 필드를 붙여 완성
+    
+    Args:
+        prefix: TYPING_ON_PREFIX 또는 TYPING_OFF_PREFIX
+        
+    Returns:
+        bytes: WebSocketMessage 와 같은 형식의 JSON 프레임
+    """
+    timestamp = orjson.dumps(datetime.now(timezone.utc), option=ORJSON_OPTIONS)
+    return prefix + b',"timestamp":' + timestamp + b',"connection_id":null}'
+
+# Redis 키/채널 접두사
+SESSION_KEY_PREFIX = "session:"      # session:{user_id} -> worker_id
+USER_CHANNEL_PREFIX = "ws:"          # ws:{user_id} 채널로 사용자 메시지 발행
+WORKER_CHANNEL_PREFIX = "ws-worker:"  # 워커별 제어 채널
+
+# 연결별 송신 큐 크기 (가득 차면 느린 클라이언트로 판단하여 연결 해제)
+OUTBOUND_QUEUE_SIZE = 256
+
+# 세션 소유 워커가 일치할 때만 세션 키 삭제 (다른 워커로 재접속한 경우 보호)
+_DELETE_SESSION_IF_OWNER = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
 class ConnectionManager:
+    """
+    WebSocket 연결 관리자
+    소켓은 워커 프로세스 내에서 관리하고, 사용자 세션 정보와 메시지 전달은
+    Redis Pub/Sub을 통해 워커 간에 공유
+    """
+    
     def __init__(self):
         self.active_connections: Dict[str, WebSocket] = {}
         self.user_sessions: Dict[str, str] = {}  # user_id -> connection_id
+        self.connection_to_user: Dict[str, str] = {}  # connection_id -> user_id
+        self.outbound_queues: Dict[str, asyncio.Queue] = {}  # connection_id -> 송신 큐
+        self.writers: Dict[str, asyncio.Task] = {}  # connection_id -> 송신 태스크
+        self.worker_id = str(uuid.uuid4())
+        self.redis: Optional[Redis] = None
+        self._pubsub: Optional[PubSub] = None
+        self._listener: Optional[asyncio.Task] = None
+        self._refresher: Optional[asyncio.Task] = None
+    
+    async def start(self, redis_url: Optional[str]) -> None:
+        """
+        Redis 연결 및 구독 리스너 시작 (애플리케이션 시작 시 호출)
+        URL 이 없거나 Redis 에 연결할 수 없으면 워커 내 연결만 관리 (API 시작은 막지 않음)
+        """
+        if not redis_url:
+            logger.info(f"ConnectionManager started without Redis (worker: {self.worker_id})")
+            return
+        
+        redis = Redis.from_url(redis_url)
+        pubsub = redis.pubsub(ignore_subscribe_messages=True)
+        try:
+            # 워커 채널을 항상 구독하여 사용자 채널이 없어도 리스너가 유지되도록 함
+            await pubsub.subscribe(f"{WORKER_CHANNEL_PREFIX}{self.worker_id}")
+        except RedisError as e:
+            logger.error(f"Redis unavailable, running in local-only mode: {e}")
+            await pubsub.aclose()
+            await redis.aclose()
+            return
+        
+        self.redis = redis
+        self._pubsub = pubsub
+        self._listener = asyncio.create_task(self._listen())
+        self._refresher = asyncio.create_task(self._refresh_sessions())
+        logger.info(f"ConnectionManager started (worker: {self.worker_id})")
+    
+    async def stop(self) -> None:
+        """구독 리스너 및 Redis 연결 종료 (애플리케이션 종료 시 호출)"""
+        for task in (self._listener, self._refresher):
+            if task:
+                task.cancel()
+                with suppress(asyncio.CancelledError):
+                    await task
+        self._listener = None
+        self._refresher = None
+        if self._pubsub:
+            await self._pubsub.aclose()
+            self._pubsub = None
+        if self.redis:
+            await self.redis.aclose()
+            self.redis = None
+    
+    async def _listen(self) -> None:
+        """다른 워커에서 발행된 메시지를 로컬 연결로 전달"""
+        while True:
+            try:
+                async for message in self._pubsub.listen():
+                    channel = message["channel"].decode()
+                    if not channel.startswith(USER_CHANNEL_PREFIX):
+                        continue
+                    
+                    connection_id = self.user_sessions.get(channel[len(USER_CHANNEL_PREFIX):])
+                    if connection_id:
+                        await self.send_bytes(message["data"], connection_id)
+            except RedisError as e:
+                logger.error(f"Redis pub/sub listener error: {e}")
+                await asyncio.sleep(1)
+    
+    async def _refresh_sessions(self) -> None:
+        """
+        이 워커에 연결된 사용자의 Redis 세션 만료 시간을 주기적으로 연장
+        클라이언트가 ping 을 보내지 않아도 연결이 유지되는 동안 세션 키가 만료되지 않도록 함
+        """
+        interval = max(settings.WS_SESSION_TTL_SECONDS / 3, 1)
+        while True:
+            await asyncio.sleep(interval)
+            if not self.user_sessions:
+                continue
+            try:
+                async with self.redis.pipeline(transaction=False) as pipe:
+                    for user_id in list(self.user_sessions):
+                        pipe.expire(f"{SESSION_KEY_PREFIX}{user_id}", settings.WS_SESSION_TTL_SECONDS)
+                    await pipe.execute()
+            except RedisError as e:
+                logger.error(f"Failed to refresh sessions: {e}")
     
     async def connect(self, websocket: WebSocket, user_id: Optional[str] = None) -> str:
         await websocket.accept()
         connection_id = str(uuid.uuid4())
         self.active_connections[connection_id] = websocket
+        # 연결마다 전용 송신 태스크를 두어 송신 측은 큐에 넣기만 하고 바로 반환
+        self.outbound_queues[connection_id] = asyncio.Queue(maxsize=OUTBOUND_QUEUE_SIZE)
+        self.writers[connection_id] = asyncio.create_task(self._writer(connection_id))
         
         if user_id:
             self.user_sessions[user_id] = connection_id
+            self.connection_to_user[connection_id] = user_id
+            await self._register_session(user_id)
         
         logger.info(f"WebSocket connected: {connection_id} (user: {user_id})")
         return connection_id
     
-    def disconnect(self, connection_id: str):
+    async def disconnect(self, connection_id: str):
         if connection_id in self.active_connections:
             del self.active_connections[connection_id]
-            # user_sessions에서도 제거
-            user_to_remove = None
-            for user_id, conn_id in self.user_sessions.items():
-                if conn_id == connection_id:
-                    user_to_remove = user_id
-                    break
-            if user_to_remove:
-                del self.user_sessions[user_to_remove]
+            self.outbound_queues.pop(connection_id, None)
+            writer = self.writers.pop(connection_id, None)
+            # 송신 태스크 내부에서 호출된 경우 자기 자신은 취소하지 않음
+            if writer is not None and writer is not asyncio.current_task():
+                writer.cancel()
+            # user_sessions에서도 제거 (같은 사용자가 재접속한 경우 새 세션은 유지)
+            user_id = self.connection_to_user.pop(connection_id, None)
+            if user_id and self.user_sessions.get(user_id) == connection_id:
+                del self.user_sessions[user_id]
+                await self._release_session(user_id)
             
             logger.info(f"WebSocket disconnected: {connection_id}")
     
+    async def close_connection(self, connection_id: str, code: int) -> None:
+        """
+        연결 정리 후 소켓 종료
+        소켓을 닫아야 수신 루프가 종료되고 클라이언트도 끊김을 인지하여 재접속할 수 있음
+        
+        Args:
+            connection_id: 연결 ID
+            code: WebSocket 종료 코드
+        """
+        websocket = self.active_connections.get(connection_id)
+        await self.disconnect(connection_id)
+        if websocket is not None and websocket.application_state == WebSocketState.CONNECTED:
+            with suppress(Exception):
+                await websocket.close(code=code)
+    
+    async def _register_session(self, user_id: str) -> None:
+        """Redis에 사용자 세션 등록 및 사용자 채널 구독"""
+        if self.redis is None:
+            return
+        try:
+            await self.redis.set(
+                f"{SESSION_KEY_PREFIX}{user_id}", self.worker_id,
+                ex=settings.WS_SESSION_TTL_SECONDS
+            )
+            await self._pubsub.subscribe(f"{USER_CHANNEL_PREFIX}{user_id}")
+        except RedisError as e:
+            logger.error(f"Failed to register session for {user_id}: {e}")
+    
+    async def _release_session(self, user_id: str) -> None:
+        """사용자 채널 구독 해제 및 Redis 세션 삭제"""
+        if self.redis is None:
+            return
+        try:
+            await self._pubsub.unsubscribe(f"{USER_CHANNEL_PREFIX}{user_id}")
+            await self.redis.eval(
+                _DELETE_SESSION_IF_OWNER, 1, f"{SESSION_KEY_PREFIX}{user_id}", self.worker_id
+            )
+        except RedisError as e:
+            logger.error(f"Failed to release session for {user_id}: {e}")
+    
+    async def refresh_session(self, user_id: Optional[str]) -> None:
+        """연결이 유지되는 동안 Redis 세션 만료 시간 연장"""
+        if self.redis is None or not user_id:
+            return
+        try:
+            await self.redis.expire(
+                f"{SESSION_KEY_PREFIX}{user_id}", settings.WS_SESSION_TTL_SECONDS
+            )
+        except RedisError as e:
+            logger.error(f"Failed to refresh session for {user_id}: {e}")
+    
+    async def is_user_connected(self, user_id: str) -> bool:
+        """사용자가 어느 워커에든 연결되어 있는지 확인"""
+        if user_id in self.user_sessions:
+            return True
+        if self.redis is None:
+            return False
+        try:
+            return bool(await self.redis.exists(f"{SESSION_KEY_PREFIX}{user_id}"))
+        except RedisError as e:
+            logger.error(f"Failed to look up session for {user_id}: {e}")
+            return False
+    
     async def send_personal_message(self, message: dict, connection_id: str) -> bool:
-        if connection_id in self.active_connections:
-            try:
-                await self.active_connections[connection_id].send_text(
-                    json.dumps(message, ensure_ascii=False, default=str)
-                )
-                return True
-            except Exception as e:
-                logger.error(f"Failed to send message to {connection_id}: {e}")
-                self.disconnect(connection_id)
-                return False
-        return False
+        return await self.send_bytes(
+            orjson.dumps(message, option=ORJSON_OPTIONS), connection_id
+        )
+    
+    async def send_model(self, message: BaseModel, connection_id: str) -> bool:
+        """Pydantic 모델을 pydantic-core 직렬화기로 바로 JSON 인코딩하여 전송"""
+        return await self.send_bytes(to_json(message), connection_id)
+    
+    async def send_bytes(self, payload: bytes, connection_id: str) -> bool:
+        """이미 직렬화된 프레임을 연결의 송신 큐에 추가"""
+        queue = self.outbound_queues.get(connection_id)
+        if queue is None:
+            return False
+        try:
+            queue.put_nowait(payload)
+            return True
+        except asyncio.QueueFull:
+            logger.error(f"Outbound queue full for {connection_id}, disconnecting")
+            await self.close_connection(connection_id, WS_1013_TRY_AGAIN_LATER)
+            return False
+    
+    async def _writer(self, connection_id: str) -> None:
+        """
+        송신 큐를 비우며 프레임 전송
+        대기 중인 프레임은 다른 작업과 섞이지 않도록 연속으로 전송
+        (프레임 경계는 프로토콜상 메시지 단위이므로 여러 프레임을 하나로 합치지 않음)
+        큐에는 orjson 으로 인코딩한 UTF-8 바이트가 들어 있지만, 클라이언트가 event.data 를
+        문자열로 받아 JSON.parse 할 수 있도록 바이너리가 아닌 텍스트 프레임으로 전송
+        """
+        queue = self.outbound_queues[connection_id]
+        websocket = self.active_connections[connection_id]
+        try:
+            while True:
+                frames = [await queue.get()]
+                while not queue.empty():
+                    frames.append(queue.get_nowait())
+                for frame in frames:
+                    await websocket.send_text(frame.decode())
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to send message to {connection_id}: {e}")
+            await self.close_connection(connection_id, WS_1011_INTERNAL_ERROR)
     
     async def send_to_user(self, message: dict, user_id: str) -> bool:
+        # 이 워커에 연결된 사용자는 Redis를 거치지 않고 바로 전송
         if user_id in self.user_sessions:
             connection_id = self.user_sessions[user_id]
             return await self.send_personal_message(message, connection_id)
-        return False
+        
+        if self.redis is None:
+            return False
+        
+        # 다른 워커에 연결된 사용자는 Pub/Sub으로 전달
+        try:
+            receivers = await self.redis.publish(
+                f"{USER_CHANNEL_PREFIX}{user_id}",
+                orjson.dumps(message, option=ORJSON_OPTIONS)
+            )
+        except RedisError as e:
+            logger.error(f"Failed to publish message to {user_id}: {e}")
+            return False
+        return receivers > 0
 
 # 전역 연결 관리자
 manager = ConnectionManager()
 
+# 키워드 -> 의도 매핑 (모든 키워드를 하나의 정규식으로 한 번에 스캔)
+KEYWORD_INTENTS = {
+    "음악": "music",
+    "노래": "music",
+    "일정": "schedule",
+    "스케줄": "schedule",
+    "안녕": "greeting",
+    "hello": "greeting",
+}
+KEYWORD_RE = re.compile("|".join(map(re.escape, KEYWORD_INTENTS)), re.IGNORECASE)
+
+
+def classify_intents(content: str) -> set:
+    """메시지에 포함된 키워드의 의도 집합 반환"""
+    return {KEYWORD_INTENTS[match.lower()] for match in KEYWORD_RE.findall(content)}
+
+
+class Broadcaster:
+    """
+    SSE 이벤트 브로드캐스터
+    하나의 생산자가 이벤트를 한 번만 직렬화하여 모든 구독자 큐에 전달
+    (연결마다 타이머를 두지 않고 구독자는 큐만 대기)
+    """
+    
+    def __init__(self, queue_size: int = 100, status_interval: float = 5.0):
+        self.subscribers: Set[asyncio.Queue] = set()
+        self.queue_size = queue_size
+        self.status_interval = status_interval
+        self._ticker: Optional[asyncio.Task] = None
+    
+    @staticmethod
+    def encode(event: Dict[str, Any]) -> bytes:
+        """이벤트를 SSE 프레임으로 인코딩"""
+        return b"data: " + orjson.dumps(event, option=ORJSON_OPTIONS) + b"\n\n"
+    
+    async def publish(self, event: Dict[str, Any]) -> None:
+        """모든 구독자에게 이벤트 전달 (큐가 가득 찬 느린 구독자는 해당 이벤트 누락)"""
+        frame = self.encode(event)
+        for queue in self.subscribers:
+            try:
+                queue.put_nowait(frame)
+            except asyncio.QueueFull:
+                logger.warning("SSE subscriber queue full, dropping event")
+    
+    async def subscribe(self) -> AsyncIterator[bytes]:
+        """구독자 큐를 등록하고 도착하는 프레임을 순서대로 반환"""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self.subscribers.add(queue)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            self.subscribers.discard(queue)
+    
+    def start(self) -> None:
+        """공용 상태 업데이트 생산자 시작 (애플리케이션 시작 시 호출)"""
+        self._ticker = asyncio.create_task(self._status_ticker())
+    
+    async def stop(self) -> None:
+        """공용 상태 업데이트 생산자 종료 (애플리케이션 종료 시 호출)"""
+        if self._ticker:
+            self._ticker.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._ticker
+            self._ticker = None
+    
+    async def _status_ticker(self) -> None:
+        """주기적으로 상태 업데이트 이벤트 발행 (예시)"""
+        counter = 0
+        while True:
+            await asyncio.sleep(self.status_interval)
+            if not self.subscribers:
+                continue
+            counter += 1
+            await self.publish({
+                "type": "status_update",
+                "data": {
+                    "message": f"실시간 업데이트 #{counter}",
+                    "timestamp": datetime.now(timezone.utc)
+                }
+            })
+
+
+broadcaster = Broadcaster()
+
+
 # Mock AI 응답 생성기 (실제로는 LLM 서비스 연동)
 async def generate_ai_response(user_message: UserMessage) -> AIResponse:
     """사용자 메시지에 대한 AI 응답 생성 (Mock)"""
     
-    # 간단한 키워드 기반 응답 생성
-    content = user_message.content.lower()
+    # 액션 블록들이 같은 생성 시간을 공유하도록 한 번만 계산
+    now = datetime.now(timezone.utc)
+    
+    # 간단한 키워드 기반 응답 생성 (우선순위: 음악 > 일정 > 인사)
+    intents = classify_intents(user_message.content)
     actions = []
     response_text = ""
     
-    if "음악" in content or "노래" in content:
+    if "music" in intents:
         response_text = "음악을 틀어드릴게요!"
         actions.append(MusicAction(
+            timestamp=now,
             title="음악 재생",
             description="요청하신 음악을 재생합니다",
             song_title="좋은 음악",
@@ -98,19 +447,21 @@ async def generate_ai_response(user_message: UserMessage) -> AIResponse:
             url="https://example.com/music/sample.mp3"
         ))
     
-    elif "일정" in content or "스케줄" in content:
+    elif "schedule" in intents:
         response_text = "일정을 확인하고 등록해드릴게요!"
         actions.append(ScheduleAction(
+            timestamp=now,
             title="일정 등록",
             description="새로운 일정을 등록합니다",
             event_title="새로운 일정",
-            start_time=datetime.now(),
+            start_time=now,
             location="회의실 A"
         ))
     
-    elif "안녕" in content or "hello" in content.lower():
+    elif "greeting" in intents:
         response_text = "안녕하세요! 저는 당신의 AI 어시스턴트입니다. 무엇을 도와드릴까요?"
         actions.append(TextAction(
+            timestamp=now,
             title="인사 응답",
             description="사용자에게 인사를 전합니다",
             content=response_text
@@ -119,6 +470,7 @@ async def generate_ai_response(user_message: UserMessage) -> AIResponse:
     else:
         response_text = f"'{user_message.content}'에 대해 이해했습니다. 더 구체적으로 말씀해 주시면 도움을 드릴 수 있습니다."
         actions.append(TextAction(
+            timestamp=now,
             title="일반 응답",
             description="사용자 메시지에 대한 일반적인 응답",
             content=response_text
@@ -157,14 +509,14 @@ async def websocket_endpoint(websocket: WebSocket, user_id: Optional[str] = None
                 "user_id": user_id
             }
         )
-        await manager.send_personal_message(welcome_message.model_dump(), connection_id)
+        await manager.send_model(welcome_message, connection_id)
         
         while True:
             # 클라이언트로부터 메시지 수신
             data = await websocket.receive_text()
             
             try:
-                message_data = json.loads(data)
+                message_data = orjson.loads(data)
                 ws_message = WebSocketMessage(**message_data)
                 
                 if ws_message.type == "user_message":
@@ -175,60 +527,59 @@ async def websocket_endpoint(websocket: WebSocket, user_id: Optional[str] = None
                     logger.info(f"Received message from {user_id}: {user_msg.content}")
                     
                     # 타이핑 인디케이터 전송
-                    typing_message = WebSocketMessage(
-                        type="typing",
-                        data={"is_typing": True, "message": "AI가 응답을 생성 중입니다..."}
-                    )
-                    await manager.send_personal_message(typing_message.model_dump(), connection_id)
+                    await manager.send_bytes(typing_frame(TYPING_ON_PREFIX), connection_id)
                     
                     # AI 응답 생성
                     ai_response = await generate_ai_response(user_msg)
                     
                     # 타이핑 종료
-                    typing_message.data["is_typing"] = False
-                    await manager.send_personal_message(typing_message.model_dump(), connection_id)
+                    await manager.send_bytes(typing_frame(TYPING_OFF_PREFIX), connection_id)
                     
                     # AI 응답 전송
                     response_message = WebSocketMessage(
                         type="ai_response",
                         data=ai_response.model_dump()
                     )
-                    await manager.send_personal_message(response_message.model_dump(), connection_id)
+                    await manager.send_model(response_message, connection_id)
                     
                 elif ws_message.type == "system":
                     # 시스템 메시지 처리 (예: 연결 상태 확인)
                     if ws_message.data.get("action") == "ping":
+                        await manager.refresh_session(user_id)
+                        # 프레임당 한 번만 현재 시각을 구해 봉투와 페이로드에 함께 사용
+                        now = datetime.now(timezone.utc)
                         pong_message = WebSocketMessage(
                             type="system",
-                            data={"action": "pong", "timestamp": datetime.now().isoformat()}
+                            data={"action": "pong", "timestamp": now},
+                            timestamp=now
                         )
-                        await manager.send_personal_message(pong_message.model_dump(), connection_id)
+                        await manager.send_model(pong_message, connection_id)
                 
-            except json.JSONDecodeError:
+            except orjson.JSONDecodeError:
                 error_message = WebSocketMessage(
                     type="error",
                     data={"error": "잘못된 JSON 형식입니다", "received_data": data}
                 )
-                await manager.send_personal_message(error_message.model_dump(), connection_id)
+                await manager.send_model(error_message, connection_id)
             
             except Exception as e:
                 error_message = WebSocketMessage(
                     type="error",
                     data={"error": f"메시지 처리 중 오류 발생: {str(e)}"}
                 )
-                await manager.send_personal_message(error_message.model_dump(), connection_id)
+                await manager.send_model(error_message, connection_id)
                 logger.error(f"Error processing message: {e}")
     
     except WebSocketDisconnect:
-        manager.disconnect(connection_id)
+        await manager.disconnect(connection_id)
         logger.info(f"WebSocket client {connection_id} disconnected")
     except Exception as e:
         logger.error(f"WebSocket error: {e}")
-        manager.disconnect(connection_id)
+        await manager.disconnect(connection_id)
 
 
 @router.get("/sse/{user_id}")
-async def sse_endpoint(request: Request, user_id: str):
+async def sse_endpoint(user_id: str):
     """
     Server-Sent Events 엔드포인트 - 일방향 실시간 스트리밍
     
@@ -241,34 +592,18 @@ async def sse_endpoint(request: Request, user_id: str):
         """SSE 이벤트 생성기"""
         try:
             # 연결 확인 이벤트
-            yield f"data: {json.dumps({'type': 'connected', 'user_id': user_id, 'timestamp': datetime.now().isoformat()}, ensure_ascii=False)}\n\n"
+            yield Broadcaster.encode({'type': 'connected', 'user_id': user_id, 'timestamp': datetime.now(timezone.utc)})
             
-            # 주기적으로 상태 업데이트 전송 (예시)
-            counter = 0
-            while True:
-                # 클라이언트 연결 상태 확인
-                if await request.is_disconnected():
-                    break
-                
-                # 샘플 데이터 전송
-                counter += 1
-                event_data = {
-                    "type": "status_update",
-                    "data": {
-                        "message": f"실시간 업데이트 #{counter}",
-                        "timestamp": datetime.now().isoformat(),
-                        "user_id": user_id
-                    }
-                }
-                
-                yield f"data: {json.dumps(event_data, ensure_ascii=False)}\n\n"
-                
-                # 5초마다 업데이트
-                await asyncio.sleep(5)
+            # 공용 브로드캐스터의 이벤트 전달
+            # 연결 종료 감지는 StreamingResponse 가 담당: receive 채널에서 http.disconnect 를 받는 즉시
+            # 태스크 그룹을 취소하므로 생성기는 대기 중인 지점에서 바로 종료됨
+            # (여기서 is_disconnected() 를 함께 호출하면 같은 receive 채널을 두고 경쟁하게 됨)
+            async for frame in broadcaster.subscribe():
+                yield frame
                 
         except Exception as e:
             logger.error(f"SSE error for user {user_id}: {e}")
-            yield f"data: {json.dumps({'type': 'error', 'error': str(e)}, ensure_ascii=False)}\n\n"
+            yield Broadcaster.encode({'type': 'error', 'error': str(e)})
     
     return StreamingResponse(
         event_generator(),
@@ -276,8 +611,6 @@ async def sse_endpoint(request: Request, user_id: str):
         headers={
             "Cache-Control": "no-cache",
             "Connection": "keep-alive",
-            "Access-Control-Allow-Origin": "*",
-            "Access-Control-Allow-Credentials": "true",
         }
     )
 
@@ -290,7 +623,7 @@ async def get_connection_status():
         "user_sessions": len(manager.user_sessions),
         "connections": list(manager.active_connections.keys()),
         "users": list(manager.user_sessions.keys()),
-        "timestamp": datetime.now().isoformat()
+        "timestamp": datetime.now(timezone.utc).isoformat()
     }
 
 
@@ -298,27 +631,23 @@ async def get_connection_status():
 async def send_message_to_user(user_id: str, message: Dict[str, Any]):
     """특정 사용자에게 메시지 전송 (REST API)"""
     
-    if user_id not in manager.user_sessions:
-        raise HTTPException(
-            status_code=HTTP_404_NOT_FOUND,
-            detail=f"User {user_id} is not connected"
-        )
-    
     ws_message = WebSocketMessage(
         type="system",
         data=message
     )
     
+    # 연결 여부는 전달 결과로 판단 (로컬 연결 또는 Pub/Sub 수신 워커 수)
+    # 세션 키 존재 여부를 먼저 확인하면 키 만료와 실제 연결 상태가 어긋날 때 잘못된 404 가 발생
     success = await manager.send_to_user(ws_message.model_dump(), user_id)
     
-    if success:
-        return {
-            "status": "success",
-            "message": f"Message sent to user {user_id}",
-            "timestamp": datetime.now().isoformat()
-        }
-    else:
+    if not success:
         raise HTTPException(
-            status_code=500,
-            detail=f"Failed to send message to user {user_id}"
+            status_code=HTTP_404_NOT_FOUND,
+            detail=f"User {user_id} is not connected"
         )
+    
+    return {
+        "status": "success",
+        "message": f"Message sent to user {user_id}",
+        "timestamp": datetime.now(timezone.utc).isoformat()
+    }
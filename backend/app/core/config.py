@@ -4,6 +4,7 @@ Application Configuration
 """
 
 import os
+from functools import lru_cache
 from typing import Optional, List
 from pydantic_settings import BaseSettings
 from pydantic import validator
@@ -40,6 +41,14 @@ class Settings(BaseSettings):
             f"{values.get('POSTGRES_DB')}"
         )
     
+    # Database Pool Configuration / 데이터베이스 커넥션 풀 설정
+    DB_POOL_SIZE: int = 20       # 상시 유지 연결 수
+    DB_MAX_OVERFLOW: int = 30    # 풀 초과 시 추가로 허용할 연결 수
+    DB_POOL_TIMEOUT: int = 10    # 연결 획득 대기 시간 (초)
+    DB_POOL_PRE_PING: bool = False  # 체크아웃마다 연결 확인 (왕복 1회 추가, 끊김이 잦은 네트워크에서만 활성화)
+    DB_POOL_RECYCLE: int = 1800  # 연결 재생성 주기 (초)
+    DB_AUTO_CREATE: bool = True  # 시작 시 테이블 자동 생성 (프로덕션에서는 마이그레이션 사용 후 비활성화)
+    
     # JWT Configuration / JWT 설정
     JWT_SECRET_KEY: str = "your-super-secret-jwt-key-change-this-in-production"
     JWT_ALGORITHM: str = "HS256"
@@ -48,10 +57,23 @@ class Settings(BaseSettings):
     
     # Security Configuration / 보안 설정
     PASSWORD_MIN_LENGTH: int = 8
-    BCRYPT_ROUNDS: int = 12
+    PASSWORD_MAX_LENGTH: int = 128  # 새로 설정하는 패스워드의 길이 상한 (기존 패스워드 검증에는 적용하지 않음)
+    # Argon2id 해싱 파라미터 (OWASP 권장값, 테스트 환경에서는 낮춰서 사용 가능)
+    # 값을 변경하면 기존 해시는 다음 로그인 시 새 파라미터로 재해싱됨
+    ARGON2_TIME_COST: int = 2
+    ARGON2_MEMORY_COST: int = 19456  # KiB
+    ARGON2_PARALLELISM: int = 1
+    # 마지막 로그인 시간 기록 간격 (초), 이 시간 안에 다시 로그인하면 DB 쓰기 생략
+    LAST_LOGIN_UPDATE_INTERVAL_SECONDS: int = 300
     
     # CORS Configuration / CORS 설정
-    ALLOWED_ORIGINS: List[str] = ["*"]  # 개발용, 프로덕션에서는 특정 도메인만 허용
+    # 허용할 출처 목록 (자격 증명을 허용하므로 와일드카드 대신 명시, 환경 변수로 JSON 목록 지정)
+    ALLOWED_ORIGINS: List[str] = ["http://localhost:3000", "http://localhost:8000"]
+    
+    # Redis Configuration / Redis 설정 (WebSocket 세션 공유 및 Pub/Sub)
+    # 미설정 시 워커 간 공유 없이 프로세스 내 연결만 관리 (단일 워커 개발 환경)
+    REDIS_URL: Optional[str] = None
+    WS_SESSION_TTL_SECONDS: int = 3600
     
     # Milvus Configuration (향후 사용) / Milvus 설정
     MILVUS_HOST: str = "milvus"
@@ -60,12 +82,14 @@ class Settings(BaseSettings):
     class Config:
         env_file = ".env"
         case_sensitive = True
+        frozen = True  # 런타임 변경 방지 (캐시된 싱글톤으로 공유)
 
 
-# 전역 설정 인스턴스
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """설정 인스턴스 반환 (의존성 주입용, 최초 1회만 생성)"""
+    return Settings()
 
 
-def get_settings() -> Settings:
-    """설정 인스턴스 반환 (의존성 주입용)"""
-    return settings
+# 전역 설정 인스턴스
+settings = get_settings()
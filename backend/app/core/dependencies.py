@@ -4,12 +4,13 @@ FastAPI 의존성 주입을 위한 인증 관련 함수들
 """
 
 from typing import Optional, Annotated
+from uuid import UUID
 from fastapi import Depends, HTTPException, status, WebSocket, Query
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 
 from app.core.security import verify_token, credentials_exception, inactive_user_exception
+from app.core.user_cache import cache_user, get_cached_user
 from app.database.postgres.connection import get_db
 from app.database.postgres.models import User
 
@@ -18,6 +19,26 @@ from app.database.postgres.models import User
 security = HTTPBearer()
 
 
+async def _load_user(db: AsyncSession, user_id: str) -> Optional[User]:
+    """캐시를 우선 확인하고, 없으면 데이터베이스에서 사용자 조회"""
+    cached = await get_cached_user(db, user_id)
+    if cached is not None:
+        return cached
+    
+    try:
+        primary_key = UUID(user_id)
+    except (TypeError, ValueError):
+        return None
+    
+    # 기본키 조회는 identity map 을 먼저 확인하고 없을 때만 SELECT 실행
+    user = await db.get(User, primary_key)
+    
+    if user is not None:
+        cache_user(user)
+    
+    return user
+
+
 async def get_current_user(
     credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)],
     db: AsyncSession = Depends(get_db)
@@ -46,9 +67,8 @@ async def get_current_user(
     if user_id is None:
         raise credentials_exception
     
-    # 데이터베이스에서 사용자 조회
-    result = await db.execute(select(User).where(User.id == user_id))
-    user = result.scalar_one_or_none()
+    # 사용자 조회 (캐시 우선)
+    user = await _load_user(db, user_id)
     
     if user is None:
         raise credentials_exception
@@ -132,10 +152,9 @@ async def get_current_user_websocket(
     if user_id is None:
         return None
     
-    # 데이터베이스에서 사용자 조회
+    # 사용자 조회 (캐시 우선)
     try:
-        result = await db.execute(select(User).where(User.id == user_id))
-        user = result.scalar_one_or_none()
+        user = await _load_user(db, user_id)
         
         if user and user.is_active:
             return user
@@ -3,17 +3,60 @@ Security utilities for authentication and authorization
 인증 및 권한 관리를 위한 보안 유틸리티
 """
 
-from datetime import datetime, timedelta
+import asyncio
+import base64
+import hashlib
+import hmac
+import os
+import string
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from typing import Optional, Union
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+import bcrypt
+import jwt
+import orjson
+from jwt import PyJWTError
+from cachetools import TTLCache
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
 from fastapi import HTTPException, status
 
 from app.core.config import settings
 
 
-# 패스워드 해싱 컨텍스트
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# 패스워드 해셔 (Argon2id, 파라미터는 설정에서 관리)
+password_hasher = PasswordHasher(
+    time_cost=settings.ARGON2_TIME_COST,
+    memory_cost=settings.ARGON2_MEMORY_COST,
+    parallelism=settings.ARGON2_PARALLELISM,
+)
+
+# 패스워드 해싱/검증 전용 스레드 풀 (기본 executor 를 쓰는 다른 작업과 분리, 코어 수만큼 병렬 처리)
+_hash_executor = ThreadPoolExecutor(max_workers=os.cpu_count(), thread_name_prefix="password-hash")
+
+# 존재하지 않거나 비활성화된 계정 로그인 시 검증 시간을 맞추기 위한 더미 해시 (import 시 한 번만 생성)
+_DUMMY_HASH = password_hasher.hash("dummy-password-for-timing")
+
+# 기존 bcrypt 해시 식별용 접두사 (검증 후 로그인 시 Argon2id 로 재해싱)
+_BCRYPT_PREFIXES = ("$2a$", "$2b$", "$2y$")
+
+# 패스워드 강도 검증용 ASCII 문자 집합 (ASCII 패스워드는 집합 연산으로 한 번에 판별)
+_ASCII_UPPER = frozenset(string.ascii_uppercase)
+_ASCII_LOWER = frozenset(string.ascii_lowercase)
+_ASCII_DIGITS = frozenset(string.digits)
+
+# 액세스 토큰 디코딩 결과 캐시 (토큰 문자열 -> 페이로드)
+_access_token_cache: TTLCache = TTLCache(maxsize=10_000, ttl=60)
+_access_token_cache_lock = threading.Lock()
+
+# HS256 서명 검증 fast path 용 사전 계산 값
+# PyJWT 가 발급하는 헤더 세그먼트와 정확히 일치하는 토큰만 fast path 로 처리
+_HS256_HEADER_B64 = base64.urlsafe_b64encode(
+    orjson.dumps({"alg": "HS256", "typ": "JWT"})
+).rstrip(b"=")
+_signer = hmac.new(settings.JWT_SECRET_KEY.encode(), digestmod=hashlib.sha256)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -28,12 +71,10 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
         str: JWT 토큰 문자열
     """
     to_encode = data.copy()
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(minutes=settings.JWT_ACCESS_TOKEN_EXPIRE_MINUTES)
+    now = datetime.now(timezone.utc)
+    expire = now + (expires_delta or timedelta(minutes=settings.JWT_ACCESS_TOKEN_EXPIRE_MINUTES))
     
-    to_encode.update({"exp": expire, "type": "access"})
+    to_encode.update({"exp": expire, "iat": now, "type": "access"})
     encoded_jwt = jwt.encode(to_encode, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
     return encoded_jwt
 
@@ -50,12 +91,10 @@ def create_refresh_token(data: dict, expires_delta: Optional[timedelta] = None)
         str: JWT 리프레시 토큰 문자열
     """
     to_encode = data.copy()
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(days=settings.JWT_REFRESH_TOKEN_EXPIRE_DAYS)
+    now = datetime.now(timezone.utc)
+    expire = now + (expires_delta or timedelta(days=settings.JWT_REFRESH_TOKEN_EXPIRE_DAYS))
     
-    to_encode.update({"exp": expire, "type": "refresh"})
+    to_encode.update({"exp": expire, "iat": now, "type": "refresh"})
     encoded_jwt = jwt.encode(to_encode, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
     return encoded_jwt
 
@@ -63,6 +102,7 @@ def create_refresh_token(data: dict, expires_delta: Optional[timedelta] = None)
 def verify_token(token: str, token_type: str = "access") -> Optional[dict]:
     """
     JWT 토큰 검증 및 디코딩
+    액세스 토큰은 검증 결과를 짧게 캐시하여 반복 요청 시 서명 검증을 생략
     
     Args:
         token: JWT 토큰 문자열
@@ -71,6 +111,81 @@ def verify_token(token: str, token_type: str = "access") -> Optional[dict]:
     Returns:
         dict: 토큰 페이로드 (검증 실패 시 None)
     """
+    if token_type != "access":
+        return _decode_token(token, token_type)
+    
+    with _access_token_cache_lock:
+        payload = _access_token_cache.get(token)
+    
+    if payload is not None:
+        # 캐시 TTL 내에 토큰이 만료될 수 있으므로 만료 시간 재확인
+        if payload["exp"] > time.time():
+            return payload
+        with _access_token_cache_lock:
+            _access_token_cache.pop(token, None)
+        return None
+    
+    payload = _decode_token(token, token_type)
+    if payload is not None and "exp" in payload:
+        with _access_token_cache_lock:
+            _access_token_cache[token] = payload
+    
+    return payload
+
+
+def _b64url_decode(segment: bytes) -> bytes:
+    """패딩이 제거된 base64url 세그먼트 디코딩"""
+    return base64.urlsafe_b64decode(segment + b"=" * (-len(segment) % 4))
+
+
+def _decode_hs256_fast(token: bytes, token_type: str) -> Optional[dict]:
+    """
+    HS256 토큰의 서명을 직접 검증하고 페이로드 디코딩
+    헤더 JSON 파싱과 알고리즘 디스패치를 생략
+    
+    Args:
+        token: 헤더가 `_HS256_HEADER_B64` 로 시작하는 JWT 토큰 바이트
+        token_type: 기대하는 토큰 타입
+        
+    Returns:
+        dict: 토큰 페이로드 (검증 실패 시 None)
+    """
+    signing_input, _, signature_b64 = token.rpartition(b".")
+    _, _, payload_b64 = signing_input.partition(b".")
+    
+    signer = _signer.copy()
+    signer.update(signing_input)
+    expected = base64.urlsafe_b64encode(signer.digest()).rstrip(b"=")
+    if not hmac.compare_digest(expected, signature_b64):
+        return None
+    
+    try:
+        payload = orjson.loads(_b64url_decode(payload_b64))
+    except (ValueError, orjson.JSONDecodeError):
+        return None
+    
+    if not isinstance(payload, dict) or payload.get("type") != token_type:
+        return None
+    
+    # PyJWT 와 동일하게 exp / nbf 클레임 확인
+    now = time.time()
+    exp = payload.get("exp")
+    if exp is not None and (not isinstance(exp, (int, float)) or exp <= now):
+        return None
+    nbf = payload.get("nbf")
+    if nbf is not None and (not isinstance(nbf, (int, float)) or nbf > now):
+        return None
+    
+    return payload
+
+
+def _decode_token(token: str, token_type: str) -> Optional[dict]:
+    """JWT 서명 검증 및 페이로드 디코딩 (캐시 미사용)"""
+    if settings.JWT_ALGORITHM == "HS256":
+        raw = token.encode()
+        if raw.count(b".") == 2 and raw.startswith(_HS256_HEADER_B64 + b"."):
+            return _decode_hs256_fast(raw, token_type)
+    
     try:
         payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
         
@@ -79,10 +194,23 @@ def verify_token(token: str, token_type: str = "access") -> Optional[dict]:
             return None
             
         return payload
-    except JWTError:
+    except PyJWTError:
         return None
 
 
+def hash_token(token: str) -> bytes:
+    """
+    리프레시 토큰 저장/조회용 해시 생성
+    
+    Args:
+        token: JWT 토큰 문자열
+        
+    Returns:
+        bytes: SHA-256 다이제스트 (32바이트, RefreshToken.token_hash 에 저장)
+    """
+    return hashlib.sha256(token.encode()).digest()
+
+
 def get_password_hash(password: str) -> str:
     """
     패스워드 해싱
@@ -93,7 +221,7 @@ def get_password_hash(password: str) -> str:
     Returns:
         str: 해싱된 패스워드
     """
-    return pwd_context.hash(password)
+    return password_hasher.hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -107,7 +235,75 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     Returns:
         bool: 패스워드 일치 여부
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    if hashed_password.startswith(_BCRYPT_PREFIXES):
+        # bcrypt 는 72바이트까지만 사용하므로 기존 해시와 동일하게 잘라서 검증
+        try:
+            return bcrypt.checkpw(plain_password.encode()[:72], hashed_password.encode())
+        except ValueError:
+            return False
+    
+    try:
+        return password_hasher.verify(hashed_password, plain_password)
+    except (VerificationError, InvalidHashError):
+        return False
+
+
+async def aget_password_hash(password: str) -> str:
+    """
+    패스워드 해싱 (비동기)
+    CPU 집약적인 해싱을 전용 스레드 풀에서 실행하여 이벤트 루프 블로킹 방지
+    
+    Args:
+        password: 평문 패스워드
+        
+    Returns:
+        str: 해싱된 패스워드
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_hash_executor, get_password_hash, password)
+
+
+async def averify_password(plain_password: str, hashed_password: str) -> bool:
+    """
+    패스워드 검증 (비동기)
+    CPU 집약적인 검증을 전용 스레드 풀에서 실행하여 이벤트 루프 블로킹 방지
+    
+    Args:
+        plain_password: 평문 패스워드
+        hashed_password: 해싱된 패스워드
+        
+    Returns:
+        bool: 패스워드 일치 여부
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_hash_executor, verify_password, plain_password, hashed_password)
+
+
+async def averify_dummy_password(plain_password: str) -> None:
+    """
+    더미 해시로 패스워드 검증 (결과는 사용하지 않음)
+    존재하지 않는 계정도 실제 검증과 같은 시간이 걸리도록 하여 계정 존재 여부 노출 방지
+    
+    Args:
+        plain_password: 평문 패스워드
+    """
+    await averify_password(plain_password, _DUMMY_HASH)
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """
+    패스워드 재해싱 필요 여부 확인
+    
+    Args:
+        hashed_password: 해싱된 패스워드
+        
+    Returns:
+        bool: 현재 해싱 파라미터와 다르거나 Argon2id 해시가 아니면 (예: 기존 bcrypt) True
+    """
+    try:
+        return password_hasher.check_needs_rehash(hashed_password)
+    except InvalidHashError:
+        return True
 
 
 def validate_password_strength(password: str) -> bool:
@@ -120,15 +316,34 @@ def validate_password_strength(password: str) -> bool:
     Returns:
         bool: 패스워드 강도 충족 여부
     """
-    if len(password) < settings.PASSWORD_MIN_LENGTH:
+    if not settings.PASSWORD_MIN_LENGTH <= len(password) <= settings.PASSWORD_MAX_LENGTH:
         return False
     
-    # 추가 검증 로직 (대소문자, 숫자, 특수문자 등)
-    has_upper = any(c.isupper() for c in password)
-    has_lower = any(c.islower() for c in password)
-    has_digit = any(c.isdigit() for c in password)
+    # ASCII 패스워드 fast path: 문자 집합을 만든 뒤 C 수준 집합 연산으로 판별
+    if password.isascii():
+        chars = set(password)
+        return not (
+            _ASCII_UPPER.isdisjoint(chars)
+            or _ASCII_LOWER.isdisjoint(chars)
+            or _ASCII_DIGITS.isdisjoint(chars)
+        )
+    
+    # 유니코드 패스워드 (대소문자, 숫자 판별을 유니코드 기준으로 수행)
+    # 한 번의 순회로 모든 조건을 확인하고, 충족되면 즉시 종료
+    has_upper = has_lower = has_digit = False
+    for c in password:
+        if c.isupper():
+            has_upper = True
+        elif c.islower():
+            has_lower = True
+        elif c.isdigit():
+            has_digit = True
+        else:
+            continue
+        if has_upper and has_lower and has_digit:
+            return True
     
-    return has_upper and has_lower and has_digit
+    return False
 
 
 # 예외 정의
@@ -0,0 +1,122 @@
+"""
+User Lookup Cache
+사용자 조회 결과를 프로세스 내에서 짧게 캐시 (인증 의존성과 UserService 가 공유)
+"""
+
+import threading
+from typing import Optional
+from cachetools import TTLCache
+from sqlalchemy import inspect
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.database.postgres.models import User
+
+
+# 사용자 스냅샷 캐시 (user_id -> 분리된 User 복사본)
+user_cache: TTLCache = TTLCache(maxsize=50_000, ttl=30)
+# 보조 인덱스 (email / username -> user_id), 조회 시 스냅샷 값과 다시 대조
+_email_index: TTLCache = TTLCache(maxsize=50_000, ttl=30)
+_username_index: TTLCache = TTLCache(maxsize=50_000, ttl=30)
+_user_cache_lock = threading.Lock()
+
+
+def _detached_copy(instance, with_relationships: bool = True):
+    """
+    세션에 속하지 않는 분리(detached) 상태의 복사본 생성
+    원본 세션의 커밋/롤백으로 만료되지 않으므로 캐시에 안전하게 보관 가능
+    (로드된 단일 관계(예: profile)는 한 단계까지만 함께 복사)
+    """
+    state = inspect(instance)
+    mapper = state.mapper
+    copy = mapper.class_(**{
+        attr.key: state.dict[attr.key]
+        for attr in mapper.column_attrs
+        if attr.key in state.dict
+    })
+    make_transient_to_detached(copy)
+    
+    if with_relationships:
+        for rel in mapper.relationships:
+            if rel.uselist or rel.key not in state.dict:
+                continue
+            value = state.dict[rel.key]
+            set_committed_value(
+                copy, rel.key, _detached_copy(value, False) if value is not None else None
+            )
+    
+    return copy
+
+
+def cache_user(user: User) -> None:
+    """
+    조회한 사용자를 캐시에 저장
+    
+    Args:
+        user: 데이터베이스에서 조회한 사용자
+    """
+    user_id = str(user.id)
+    snapshot = _detached_copy(user)
+    with _user_cache_lock:
+        user_cache[user_id] = snapshot
+        # 조회는 대소문자를 구분하지 않으므로 (lower() 인덱스) 소문자 키로 저장
+        _email_index[user.email.lower()] = user_id
+        _username_index[user.username.lower()] = user_id
+
+
+def invalidate_user_cache(user_id) -> None:
+    """
+    사용자 캐시 무효화
+    패스워드 변경, 로그아웃, 정보 수정 등 사용자 상태가 바뀌었을 때 호출
+    (email/username 인덱스는 조회 시 스냅샷과 대조하므로 별도 삭제 불필요)
+    
+    Args:
+        user_id: 사용자 ID
+    """
+    with _user_cache_lock:
+        user_cache.pop(str(user_id), None)
+
+
+async def get_cached_user(
+    db: AsyncSession,
+    user_id: Optional[str] = None,
+    *,
+    email: Optional[str] = None,
+    username: Optional[str] = None
+) -> Optional[User]:
+    """
+    캐시된 사용자를 현재 세션에 연결하여 반환 (DB 조회 없음)
+    
+    Args:
+        db: 데이터베이스 세션
+        user_id: 사용자 ID
+        email: 소문자로 정규화된 이메일 (user_id 가 없을 때 사용)
+        username: 소문자로 정규화된 사용자명 (user_id, email 이 없을 때 사용)
+    
+    Returns:
+        Optional[User]: 현재 세션에 연결된 사용자 (캐시에 없으면 None)
+    """
+    with _user_cache_lock:
+        if user_id is None:
+            if email is not None:
+                user_id = _email_index.get(email)
+            elif username is not None:
+                user_id = _username_index.get(username)
+        cached = user_cache.get(user_id) if user_id is not None else None
+    
+    if cached is None:
+        return None
+    
+    # 이메일/사용자명이 변경된 경우 이전 인덱스로 다른 값을 반환하지 않도록 확인
+    if (email is not None and cached.email.lower() != email) or (
+        username is not None and cached.username.lower() != username
+    ):
+        return None
+    
+    try:
+        return await db.merge(cached, load=False)
+    except InvalidRequestError:
+        invalidate_user_cache(user_id)
+        return None
@@ -3,21 +3,43 @@ PostgreSQL Database Connection
 PostgreSQL 데이터베이스 연결 관리
 """
 
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
 from typing import AsyncGenerator
 import logging
 
+import orjson
+
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+
+def _json_serializer(value) -> str:
+    """JSON/JSONB 컬럼 직렬화 (orjson 사용, 드라이버가 str 을 요구하므로 디코딩)"""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
 # SQLAlchemy 비동기 엔진 생성
 engine = create_async_engine(
     settings.DATABASE_URL,
     echo=settings.DEBUG,  # 개발 모드에서 SQL 쿼리 로깅
-    pool_pre_ping=True,   # 연결 상태 확인
-    pool_recycle=300,     # 5분마다 연결 재생성
+    pool_size=settings.DB_POOL_SIZE,          # 상시 유지 연결 수
+    max_overflow=settings.DB_MAX_OVERFLOW,    # 동시 요청 급증 시 추가 연결
+    pool_timeout=settings.DB_POOL_TIMEOUT,    # 풀 고갈 시 빠르게 실패
+    pool_pre_ping=settings.DB_POOL_PRE_PING,  # 체크아웃 시 연결 상태 확인 (기본 비활성화)
+    pool_recycle=settings.DB_POOL_RECYCLE,    # 주기적으로 연결 재생성
+    query_cache_size=1200,  # 컴파일된 SQL 캐시 크기 (기본 500, 서비스의 쿼리 종류가 모두 들어가도록 확대)
+    json_serializer=_json_serializer,
+    json_deserializer=orjson.loads,
+    connect_args={
+        # 반복 쿼리는 Parse/Plan 을 생략하도록 prepared statement 캐시 확대
+        "statement_cache_size": 1024,             # asyncpg 연결별 캐시
+        "prepared_statement_cache_size": 1024,    # SQLAlchemy asyncpg 어댑터 캐시
+        # 짧은 OLTP 쿼리에서는 JIT 컴파일 비용이 더 크므로 비활성화
+        "server_settings": {"jit": "off"},
+    },
 )
 
 # 비동기 세션 팩토리
@@ -50,8 +72,6 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             logger.error(f"Database session error: {e}")
             await session.rollback()
             raise
-        finally:
-            await session.close()
 
 
 async def init_db() -> None:
@@ -59,8 +79,15 @@ async def init_db() -> None:
     데이터베이스 초기화
     테이블 생성 및 초기 데이터 설정
     """
+    if not settings.DB_AUTO_CREATE:
+        logger.info("Database auto-create disabled, skipping schema creation")
+        return
+    
     try:
+        # 모든 DDL 을 하나의 트랜잭션에서 실행
         async with engine.begin() as conn:
+            # 스키마 생성 트랜잭션은 WAL flush 를 기다리지 않도록 설정 (이 트랜잭션에만 적용)
+            await conn.exec_driver_sql("SET LOCAL synchronous_commit = off")
             # 모든 테이블 생성 (실제로는 Alembic 마이그레이션 사용 권장)
             await conn.run_sync(Base.metadata.create_all)
         
@@ -92,8 +119,9 @@ async def check_db_health() -> bool:
         bool: 연결 상태 (True: 정상, False: 오류)
     """
     try:
-        async with AsyncSessionLocal() as session:
-            await session.execute("SELECT 1")
+        # ORM 세션 없이 커넥션만 가볍게 획득하여 확인
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
             return True
     except Exception as e:
         logger.error(f"Database health check failed: {e}")
@@ -3,23 +3,33 @@ PostgreSQL Database Models
 사용자 및 채팅 관련 SQLAlchemy 모델
 """
 
-from sqlalchemy import Column, String, Boolean, DateTime, Text, Integer, ForeignKey, JSON
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Boolean, DateTime, Text, Integer, ForeignKey, Index, LargeBinary, insert, text
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-from datetime import datetime
+from datetime import datetime, timezone
+from typing import Any, Dict, List
 import uuid
 
+import orjson
+
 from app.database.postgres.connection import Base
 
 
 class User(Base):
     """사용자 모델"""
     __tablename__ = "users"
+    __table_args__ = (
+        # 대소문자 구분 없는 유일성 보장 및 lower() 조회용 함수 인덱스
+        Index("idx_users_lower_email", func.lower(text("email")), unique=True),
+        Index("idx_users_lower_username", func.lower(text("username")), unique=True),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    email = Column(String(255), unique=True, nullable=False, index=True)
-    username = Column(String(100), unique=True, nullable=False, index=True)
+    # 유일성과 조회 인덱스는 __table_args__ 의 lower() 유니크 인덱스가 담당
+    email = Column(String(255), nullable=False)
+    username = Column(String(100), nullable=False)
     hashed_password = Column(String(255), nullable=False)
     full_name = Column(String(255))
     is_active = Column(Boolean, default=True, index=True)
@@ -29,10 +39,26 @@ class User(Base):
     last_login = Column(DateTime(timezone=True))
 
     # 관계 설정
-    profile = relationship("UserProfile", back_populates="user", uselist=False, cascade="all, delete-orphan")
-    chat_sessions = relationship("ChatSession", back_populates="user", cascade="all, delete-orphan")
-    chat_messages = relationship("ChatMessage", back_populates="user", cascade="all, delete-orphan")
-    refresh_tokens = relationship("RefreshToken", back_populates="user", cascade="all, delete-orphan")
+    # 비동기 세션에서는 암묵적 지연 로딩이 불가하므로 로딩 전략을 명시
+    # - profile: 항상 함께 쓰이므로 JOIN 으로 즉시 로딩
+    # - 컬렉션: 접근 시 예외 발생 (필요한 쿼리에서 selectinload 로 명시적 로딩)
+    #   삭제는 DB 의 ON DELETE CASCADE 에 맡겨 컬렉션을 로딩하지 않도록 passive_deletes 사용
+    profile = relationship(
+        "UserProfile", back_populates="user", uselist=False,
+        cascade="all, delete-orphan", lazy="joined"
+    )
+    chat_sessions = relationship(
+        "ChatSession", back_populates="user",
+        cascade="all, delete-orphan", lazy="raise", passive_deletes=True
+    )
+    chat_messages = relationship(
+        "ChatMessage", back_populates="user",
+        cascade="all, delete-orphan", lazy="raise", passive_deletes=True
+    )
+    refresh_tokens = relationship(
+        "RefreshToken", back_populates="user",
+        cascade="all, delete-orphan", lazy="raise", passive_deletes=True
+    )
 
     def __repr__(self):
         return f"<User(id={self.id}, email={self.email}, username={self.username})>"
@@ -41,13 +67,17 @@ class User(Base):
 class UserProfile(Base):
     """사용자 프로필 모델"""
     __tablename__ = "user_profiles"
+    __table_args__ = (
+        # 선호도 키/값 포함 여부 필터링(@>, ?)용 GIN 인덱스
+        Index("idx_user_profiles_preferences_gin", "preferences", postgresql_using="gin"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     avatar_url = Column(String(500))
     bio = Column(Text)
-    preferences = Column(JSON, default={})  # 사용자 선호도 설정
-    settings = Column(JSON, default={})     # 앱 설정
+    preferences = Column(JSONB, nullable=False, server_default=text("'{}'::jsonb"))  # 사용자 선호도 설정
+    settings = Column(JSONB, nullable=False, server_default=text("'{}'::jsonb"))     # 앱 설정
     timezone = Column(String(50), default="UTC")
     language = Column(String(10), default="ko")
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -64,7 +94,7 @@ class ChatSession(Base):
     """채팅 세션 모델"""
     __tablename__ = "chat_sessions"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=False), primary_key=True, server_default=text("gen_random_uuid()"))
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     title = Column(String(255))
     is_active = Column(Boolean, default=True)
@@ -74,7 +104,10 @@ class ChatSession(Base):
 
     # 관계 설정
     user = relationship("User", back_populates="chat_sessions")
-    messages = relationship("ChatMessage", back_populates="session", cascade="all, delete-orphan")
+    messages = relationship(
+        "ChatMessage", back_populates="session",
+        cascade="all, delete-orphan", lazy="selectin", passive_deletes=True
+    )
 
     def __repr__(self):
         return f"<ChatSession(id={self.id}, user_id={self.user_id}, title={self.title})>"
@@ -83,13 +116,18 @@ class ChatSession(Base):
 class ChatMessage(Base):
     """채팅 메시지 모델"""
     __tablename__ = "chat_messages"
-
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    session_id = Column(UUID(as_uuid=True), ForeignKey("chat_sessions.id", ondelete="CASCADE"), nullable=False)
+    __table_args__ = (
+        # 세션/사용자별 메시지를 시간순으로 조회하는 패턴용 복합 인덱스
+        Index("idx_chat_messages_session_created", "session_id", "created_at"),
+        Index("idx_chat_messages_user_created", "user_id", "created_at"),
+    )
+
+    id = Column(UUID(as_uuid=False), primary_key=True, server_default=text("gen_random_uuid()"))
+    session_id = Column(UUID(as_uuid=False), ForeignKey("chat_sessions.id", ondelete="CASCADE"), nullable=False)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     message_type = Column(String(20), nullable=False)  # 'user', 'assistant', 'system'
     content = Column(Text, nullable=False)
-    message_metadata = Column(JSON, default={})  # 추가 메타데이터 (액션 블록 등)
+    message_metadata = Column(JSONB, nullable=False, server_default=text("'{}'::jsonb"))  # 추가 메타데이터 (액션 블록 등)
     vector_id = Column(String(255))       # Milvus 벡터 ID 참조
     created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
 
@@ -104,10 +142,14 @@ class ChatMessage(Base):
 class RefreshToken(Base):
     """리프레시 토큰 모델"""
     __tablename__ = "refresh_tokens"
+    __table_args__ = (
+        # 사용자의 유효한 토큰 조회를 단일 인덱스 탐색으로 처리
+        Index("idx_refresh_tokens_user_active", "user_id", "is_revoked", "expires_at"),
+    )
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=False), primary_key=True, server_default=text("gen_random_uuid()"))
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
-    token_hash = Column(String(255), nullable=False)
+    token_hash = Column(LargeBinary(32), nullable=False, unique=True, index=True)  # SHA-256 원시 바이트 (security.hash_token)
     expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
     is_revoked = Column(Boolean, default=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -118,3 +160,64 @@ class RefreshToken(Base):
 
     def __repr__(self):
         return f"<RefreshToken(id={self.id}, user_id={self.user_id}, expires_at={self.expires_at})>"
+
+
+# 이 크기 이상의 배치는 COPY 로, 미만은 executemany INSERT 로 처리
+COPY_THRESHOLD = 500
+
+_CHAT_MESSAGE_COPY_COLUMNS = [
+    "session_id", "user_id", "message_type", "content",
+    "message_metadata", "vector_id", "created_at",
+]
+
+
+async def bulk_insert_messages(session: AsyncSession, rows: List[Dict[str, Any]]) -> int:
+    """
+    채팅 메시지 일괄 삽입 (기록 import, 백필 등)
+    큰 배치는 asyncpg COPY, 작은 배치는 executemany INSERT 사용
+    세션의 현재 트랜잭션 안에서 실행되며 커밋은 호출자가 담당 (id 는 DB 에서 생성)
+    
+    Args:
+        session: 데이터베이스 세션
+        rows: ChatMessage 컬럼명을 키로 갖는 딕셔너리 목록
+              (session_id, user_id, message_type, content 필수)
+        
+    Returns:
+        int: 삽입된 행 수
+    """
+    if not rows:
+        return 0
+    
+    now = datetime.now(timezone.utc)
+    
+    if len(rows) < COPY_THRESHOLD:
+        await session.execute(insert(ChatMessage), [
+            {"message_metadata": {}, "created_at": now, **row}
+            for row in rows
+        ])
+        return len(rows)
+    
+    records = [
+        (
+            row["session_id"],
+            row["user_id"],
+            row["message_type"],
+            row["content"],
+            # COPY 는 타입 처리기를 거치지 않으므로 JSON 을 직접 문자열로 인코딩
+            orjson.dumps(row.get("message_metadata") or {}).decode(),
+            row.get("vector_id"),
+            row.get("created_at") or now,
+        )
+        for row in rows
+    ]
+    
+    conn = await session.connection()
+    raw = (await conn.get_raw_connection()).driver_connection
+    if not raw.is_in_transaction():
+        # asyncpg 트랜잭션은 첫 쿼리 실행 시 시작되므로, COPY 가 자동 커밋되지 않도록 먼저 시작
+        await conn.execute(text("SELECT 1"))
+    
+    await raw.copy_records_to_table(
+        ChatMessage.__tablename__, records=records, columns=_CHAT_MESSAGE_COPY_COLUMNS
+    )
+    return len(records)
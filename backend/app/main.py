@@ -1,10 +1,12 @@
 from fastapi import FastAPI, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 from contextlib import asynccontextmanager
 
 # Import routers
 from app.api.endpoints import communication, auth
+from app.core.config import settings
 from app.database.postgres.connection import init_db, close_db
 
 
@@ -13,8 +15,14 @@ async def lifespan(app: FastAPI):
     """애플리케이션 생명주기 관리"""
     # 시작 시 데이터베이스 초기화
     await init_db()
+    # WebSocket 세션 공유를 위한 Redis Pub/Sub 연결
+    await communication.manager.start(settings.REDIS_URL)
+    # SSE 공용 이벤트 생산자 시작
+    communication.broadcaster.start()
     yield
-    # 종료 시 데이터베이스 연결 해제
+    # 종료 시 SSE 생산자, Redis 및 데이터베이스 연결 해제
+    await communication.broadcaster.stop()
+    await communication.manager.stop()
     await close_db()
 
 # Create FastAPI app instance
@@ -23,17 +31,19 @@ app = FastAPI(
     title="Friend-like AI Assistant",
     description="A personalized AI assistant with real-time communication and user authentication",
     version="0.1.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,  # 응답 JSON 인코딩에 orjson 사용
 )
 
 # Add CORS middleware
 # CORS 미들웨어 추가
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # 모든 도메인 허용 (개발용)
+    allow_origins=tuple(settings.ALLOWED_ORIGINS),  # 설정된 도메인만 허용
     allow_credentials=True,
-    allow_methods=["*"],  # 모든 HTTP 메서드 허용
-    allow_headers=["*"],  # 모든 헤더 허용
+    allow_methods=("GET", "POST", "PUT", "DELETE", "OPTIONS"),
+    allow_headers=("authorization", "content-type"),
+    max_age=86400,  # 브라우저가 preflight 응답을 하루 동안 캐시
 )
 
 # Include routers
@@ -55,8 +65,13 @@ class HealthCheckResponse(BaseModel):
     status: str = "ok"
 
 
+# Prebuilt health check payload, reused for every probe.
+# 매 요청마다 모델을 생성하지 않도록 미리 만들어 둔 상태 확인 응답
+_HEALTH_OK = {"status": "ok"}
+
+
 @app.get("/", tags=["Root"], summary="Welcome message")
-def read_root():
+async def read_root():
     """
     Root endpoint that returns a welcome message.
     시작을 알리는 루트 엔드포인트입니다.
@@ -68,12 +83,12 @@ def read_root():
     "/health",
     tags=["Health Check"],
     summary="Perform a Health Check",
-    response_model=HealthCheckResponse,
+    responses={status.HTTP_200_OK: {"model": HealthCheckResponse}},  # 문서화 용도
     status_code=status.HTTP_200_OK,
 )
-def perform_health_check():
+async def perform_health_check():
     """
     Performs a health check and returns the status of the API.
     API의 상태를 확인하고 상태를 반환합니다.
     """
-    return HealthCheckResponse(status="ok")
\ No newline at end of file
+    return _HEALTH_OK
\ No newline at end of file
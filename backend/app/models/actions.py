@@ -4,11 +4,16 @@ AI 어시스턴트의 응답을 위한 액션 블록 데이터 모델 정의
 """
 
 from pydantic import BaseModel, Field
-from typing import Optional, Dict, Any, List, Literal
-from datetime import datetime
+from typing import Annotated, Optional, Dict, Any, List, Literal, Union
+from datetime import datetime, timezone
 from enum import Enum
 
 
+def _utcnow() -> datetime:
+    """기본 생성 시간 (UTC, timezone-aware)"""
+    return datetime.now(timezone.utc)
+
+
 class ActionType(str, Enum):
     """액션 블록 타입 정의"""
     TEXT = "text"
@@ -32,7 +37,7 @@ class BaseAction(BaseModel):
     type: ActionType
     title: str = Field(..., description="액션 제목")
     description: Optional[str] = Field(None, description="액션 설명")
-    timestamp: datetime = Field(default_factory=datetime.now, description="생성 시간")
+    timestamp: datetime = Field(default_factory=_utcnow, description="생성 시간")
     metadata: Dict[str, Any] = Field(default_factory=dict, description="추가 메타데이터")
 
 
@@ -108,12 +113,23 @@ class CalculateAction(BaseAction):
     result: str = Field(..., description="계산 결과")
 
 
+# 유니온 타입으로 모든 액션 타입 정의
+# type 필드를 판별자로 사용하여 파싱 시 해당 모델로 바로 분기
+ActionBlock = Annotated[
+    Union[
+        TextAction, MusicAction, ScheduleAction, ReminderAction,
+        SearchAction, WeatherAction, TimerAction, CalculateAction,
+    ],
+    Field(discriminator="type"),
+]
+
+
 # 메시지 모델들
 class UserMessage(BaseModel):
     """사용자 메시지 모델"""
     content: str = Field(..., description="메시지 내용")
     message_type: Literal["text", "voice", "image"] = Field("text", description="메시지 타입")
-    timestamp: datetime = Field(default_factory=datetime.now, description="전송 시간")
+    timestamp: datetime = Field(default_factory=_utcnow, description="전송 시간")
     user_id: Optional[str] = Field(None, description="사용자 ID")
     session_id: Optional[str] = Field(None, description="세션 ID")
 
@@ -122,22 +138,15 @@ class AIResponse(BaseModel):
     """AI 응답 모델"""
     message_id: str = Field(..., description="메시지 고유 ID")
     response_text: str = Field(..., description="AI 응답 텍스트")
-    actions: List[BaseAction] = Field(default_factory=list, description="실행할 액션 블록들")
+    actions: List[ActionBlock] = Field(default_factory=list, description="실행할 액션 블록들")
     confidence_score: Optional[float] = Field(None, description="응답 신뢰도 (0-1)")
     processing_time_ms: Optional[int] = Field(None, description="처리 시간(밀리초)")
-    timestamp: datetime = Field(default_factory=datetime.now, description="응답 시간")
+    timestamp: datetime = Field(default_factory=_utcnow, description="응답 시간")
 
 
 class WebSocketMessage(BaseModel):
     """WebSocket 메시지 모델"""
     type: Literal["user_message", "ai_response", "system", "error", "typing"] = Field(..., description="메시지 타입")
     data: Dict[str, Any] = Field(..., description="메시지 데이터")
-    timestamp: datetime = Field(default_factory=datetime.now, description="메시지 시간")
+    timestamp: datetime = Field(default_factory=_utcnow, description="메시지 시간")
     connection_id: Optional[str] = Field(None, description="연결 ID")
-
-
-# 유니온 타입으로 모든 액션 타입 정의
-ActionBlock = (
-    TextAction | MusicAction | ScheduleAction | ReminderAction |
-    SearchAction | WeatherAction | TimerAction | CalculateAction
-)
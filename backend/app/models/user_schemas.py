@@ -3,11 +3,36 @@ User-related Pydantic Schemas
 사용자 관련 요청/응답 스키마 정의
 """
 
-from pydantic import BaseModel, Field, EmailStr, validator
-from typing import Optional, Dict, Any
+import re
+from functools import lru_cache
+
+from pydantic import AfterValidator, BaseModel, ConfigDict, Field, EmailStr, TypeAdapter, ValidationInfo, field_validator
+from typing import Annotated, Optional, Dict, Any, Type
 from datetime import datetime
 from uuid import UUID
 
+from app.core.config import settings
+
+
+# 영문/숫자/언더스코어/하이픈으로 구성되고 영문 또는 숫자를 하나 이상 포함
+_USERNAME_RE = re.compile(r"[A-Za-z0-9_-]*[A-Za-z0-9][A-Za-z0-9_-]*")
+
+
+def _validate_username(v: str) -> str:
+    """사용자명 검증"""
+    if not _USERNAME_RE.fullmatch(v):
+        raise ValueError('사용자명은 영문, 숫자, 언더스코어, 하이픈만 사용 가능합니다')
+    return v.lower()
+
+
+# 여러 스키마에서 공유하는 검증 타입 (검증기는 타입 단위로 한 번만 구성)
+EmailLower = Annotated[EmailStr, AfterValidator(str.lower)]
+Username = Annotated[str, Field(min_length=3, max_length=50), AfterValidator(_validate_username)]
+# 새로 설정하는 패스워드 (길이 제한은 설정값 기준, 기존 패스워드 검증 입력에는 적용하지 않음)
+NewPassword = Annotated[
+    str, Field(min_length=settings.PASSWORD_MIN_LENGTH, max_length=settings.PASSWORD_MAX_LENGTH)
+]
+
 
 class UserBase(BaseModel):
     """사용자 기본 스키마"""
@@ -18,46 +43,22 @@ class UserBase(BaseModel):
 
 class UserCreate(UserBase):
     """사용자 생성 스키마"""
-    password: str = Field(..., min_length=8, description="패스워드")
-    
-    @validator('username')
-    def validate_username(cls, v):
-        """사용자명 검증"""
-        if not v.replace('_', '').replace('-', '').isalnum():
-            raise ValueError('사용자명은 영문, 숫자, 언더스코어, 하이픈만 사용 가능합니다')
-        return v.lower()
-    
-    @validator('email')
-    def validate_email(cls, v):
-        """이메일 검증"""
-        return v.lower()
+    email: EmailLower = Field(..., description="이메일 주소")
+    username: Username = Field(..., description="사용자명")
+    password: NewPassword = Field(..., description="패스워드")
 
 
 class UserUpdate(BaseModel):
     """사용자 정보 업데이트 스키마"""
-    email: Optional[EmailStr] = Field(None, description="이메일 주소")
-    username: Optional[str] = Field(None, min_length=3, max_length=50, description="사용자명")
+    email: Optional[EmailLower] = Field(None, description="이메일 주소")
+    username: Optional[Username] = Field(None, description="사용자명")
     full_name: Optional[str] = Field(None, max_length=100, description="전체 이름")
-    
-    @validator('username')
-    def validate_username(cls, v):
-        if v is not None:
-            if not v.replace('_', '').replace('-', '').isalnum():
-                raise ValueError('사용자명은 영문, 숫자, 언더스코어, 하이픈만 사용 가능합니다')
-            return v.lower()
-        return v
-    
-    @validator('email')
-    def validate_email(cls, v):
-        if v is not None:
-            return v.lower()
-        return v
 
 
 class PasswordChange(BaseModel):
     """패스워드 변경 스키마"""
     old_password: str = Field(..., description="기존 패스워드")
-    new_password: str = Field(..., min_length=8, description="새 패스워드")
+    new_password: NewPassword = Field(..., description="새 패스워드")
 
 
 class UserProfileBase(BaseModel):
@@ -83,8 +84,7 @@ class UserProfileResponse(UserProfileBase):
     created_at: datetime
     updated_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class UserResponse(UserBase):
@@ -97,8 +97,7 @@ class UserResponse(UserBase):
     last_login: Optional[datetime]
     profile: Optional[UserProfileResponse] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class UserPublicResponse(BaseModel):
@@ -110,19 +109,14 @@ class UserPublicResponse(BaseModel):
     bio: Optional[str] = None
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # 인증 관련 스키마
 class LoginRequest(BaseModel):
     """로그인 요청 스키마"""
-    email: EmailStr = Field(..., description="이메일 주소")
+    email: EmailLower = Field(..., description="이메일 주소")
     password: str = Field(..., description="패스워드")
-    
-    @validator('email')
-    def validate_email(cls, v):
-        return v.lower()
 
 
 class TokenResponse(BaseModel):
@@ -142,9 +136,10 @@ class RegisterRequest(UserCreate):
     """회원가입 요청 스키마"""
     confirm_password: str = Field(..., description="패스워드 확인")
     
-    @validator('confirm_password')
-    def passwords_match(cls, v, values):
-        if 'password' in values and v != values['password']:
+    @field_validator('confirm_password')
+    @classmethod
+    def passwords_match(cls, v, info: ValidationInfo):
+        if 'password' in info.data and v != info.data['password']:
             raise ValueError('패스워드가 일치하지 않습니다')
         return v
 
@@ -163,21 +158,42 @@ class EmailVerificationRequest(BaseModel):
 
 class PasswordResetRequest(BaseModel):
     """패스워드 재설정 요청 스키마"""
-    email: EmailStr = Field(..., description="이메일 주소")
-    
-    @validator('email')
-    def validate_email(cls, v):
-        return v.lower()
+    email: EmailLower = Field(..., description="이메일 주소")
 
 
 class PasswordResetConfirm(BaseModel):
     """패스워드 재설정 확인 스키마"""
     token: str = Field(..., description="패스워드 재설정 토큰")
-    new_password: str = Field(..., min_length=8, description="새 패스워드")
+    new_password: NewPassword = Field(..., description="새 패스워드")
     confirm_password: str = Field(..., description="패스워드 확인")
     
-    @validator('confirm_password')
-    def passwords_match(cls, v, values):
-        if 'new_password' in values and v != values['new_password']:
+    @field_validator('confirm_password')
+    @classmethod
+    def passwords_match(cls, v, info: ValidationInfo):
+        if 'new_password' in info.data and v != info.data['new_password']:
             raise ValueError('패스워드가 일치하지 않습니다')
         return v
+
+
+@lru_cache(maxsize=None)
+def _adapter_for(cls: Type[BaseModel]) -> TypeAdapter:
+    """스키마별 TypeAdapter (첫 사용 시 한 번만 구성)"""
+    return TypeAdapter(cls)
+
+
+def dump_json(cls: Type[BaseModel], obj: Any) -> bytes:
+    """
+    응답 스키마 기준으로 JSON 바이트 직렬화
+    엔드포인트에서 바로 Response 로 반환하여 FastAPI 의 응답 재검증/인코딩 단계를 생략
+    
+    Args:
+        cls: 응답 스키마 클래스
+        obj: 스키마 인스턴스 또는 ORM 객체 (from_attributes 로 변환)
+        
+    Returns:
+        bytes: 직렬화된 JSON
+    """
+    adapter = _adapter_for(cls)
+    if not isinstance(obj, cls):
+        obj = adapter.validate_python(obj, from_attributes=True)
+    return adapter.dump_json(obj)
@@ -3,18 +3,58 @@ User Service
 사용자 관리를 위한 비즈니스 로직
 """
 
-from typing import Optional, List
+from typing import NamedTuple, Optional, List
 from uuid import UUID
+from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update
+from sqlalchemy import func, select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import selectinload
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 
+from app.core.config import settings
+from app.core.user_cache import cache_user, get_cached_user, invalidate_user_cache
+from app.database.postgres.connection import get_db
 from app.database.postgres.models import User, UserProfile
-from app.core.security import get_password_hash, verify_password, validate_password_strength
+from app.core.security import (
+    aget_password_hash, averify_dummy_password, averify_password,
+    password_needs_rehash, validate_password_strength
+)
 from app.models.user_schemas import UserCreate, UserUpdate, UserProfileUpdate
 
 
+# 로딩 옵션은 모듈 수준에서 한 번만 생성하여 재사용 (SQLAlchemy 컴파일 캐시 키 생성 비용 절감)
+# 일반 SELECT 는 매퍼 기본값(lazy="joined")으로 프로필을 JOIN 하므로 옵션 불필요
+# UPDATE ... RETURNING 에는 JOIN 을 붙일 수 없어 프로필을 별도 SELECT IN 으로 로딩
+_RETURNING_PROFILE_LOAD_OPTION = selectinload(User.profile)
+
+
+class AuthUser(NamedTuple):
+    """
+    인증 경로 조회 결과
+    인증에 필요한 컬럼만 담은 값 객체 (세션에 연결된 ORM 객체가 아니므로
+    로드되지 않은 속성에 접근하다 지연 로딩 오류가 나는 일이 없음)
+    """
+    id: UUID
+    email: str
+    hashed_password: str
+    is_active: bool
+    last_login: Optional[datetime]
+
+
+# 인증 경로 전용 조회 컬럼 (ORM 객체와 프로필을 만들지 않고 필요한 컬럼만 조회)
+_AUTH_COLUMNS = (User.id, User.email, User.hashed_password, User.is_active, User.last_login)
+
+# 패스워드 강도 미충족 안내 (길이 기준은 설정과 동일하게 유지)
+_PASSWORD_STRENGTH_MESSAGE = (
+    f"패스워드는 {settings.PASSWORD_MIN_LENGTH}자 이상 {settings.PASSWORD_MAX_LENGTH}자 이하이고, "
+    "대문자, 소문자, 숫자를 포함해야 합니다"
+)
+
+# 마지막 로그인 시간 기록 간격
+_LAST_LOGIN_UPDATE_INTERVAL = timedelta(seconds=settings.LAST_LOGIN_UPDATE_INTERVAL_SECONDS)
+
+
 class UserService:
     """사용자 관리 서비스"""
     
@@ -34,26 +74,16 @@ class UserService:
         Raises:
             ValueError: 이메일 중복, 패스워드 강도 부족 등
         """
-        # 이메일 중복 확인
-        existing_user = await self.get_user_by_email(user_data.email)
-        if existing_user:
-            raise ValueError("이미 등록된 이메일입니다")
-        
-        # 사용자명 중복 확인
-        existing_username = await self.get_user_by_username(user_data.username)
-        if existing_username:
-            raise ValueError("이미 사용 중인 사용자명입니다")
-        
         # 패스워드 강도 검증
         if not validate_password_strength(user_data.password):
-            raise ValueError(
-                f"패스워드는 최소 8자 이상이고, 대문자, 소문자, 숫자를 포함해야 합니다"
-            )
+            raise ValueError(_PASSWORD_STRENGTH_MESSAGE)
         
         # 패스워드 해싱
-        hashed_password = get_password_hash(user_data.password)
+        hashed_password = await aget_password_hash(user_data.password)
         
-        # 사용자 생성
+        # 사용자 및 기본 프로필 생성
+        # 관계로 연결하여 하나의 flush 에서 함께 INSERT (ID 는 클라이언트에서 생성,
+        # 서버 기본값은 INSERT ... RETURNING 으로 받아오므로 별도 refresh 불필요)
         db_user = User(
             email=user_data.email,
             username=user_data.username,
@@ -62,13 +92,7 @@ class UserService:
             is_active=True,
             is_verified=False  # 이메일 인증 필요
         )
-        
-        self.db.add(db_user)
-        await self.db.flush()  # ID 생성을 위해 flush
-        
-        # 기본 프로필 생성
-        db_profile = UserProfile(
-            user_id=db_user.id,
+        db_user.profile = UserProfile(
             preferences={},
             settings={
                 "theme": "light",
@@ -79,13 +103,32 @@ class UserService:
             language="ko"
         )
         
-        self.db.add(db_profile)
-        await self.db.commit()
-        await self.db.refresh(db_user)
+        # 이메일/사용자명 중복은 사전 SELECT 대신 유니크 제약 위반으로 판별
+        # (추가 왕복이 없고, 동시 가입 시의 경쟁 상태도 발생하지 않음)
+        self.db.add(db_user)
+        try:
+            await self.db.commit()
+        except IntegrityError as e:
+            await self.db.rollback()
+            if self._violated_constraint(e, "username"):
+                raise ValueError("이미 사용 중인 사용자명입니다") from e
+            if self._violated_constraint(e, "email"):
+                raise ValueError("이미 등록된 이메일입니다") from e
+            raise
         
         return db_user
     
-    async def authenticate_user(self, email: str, password: str) -> Optional[User]:
+    @staticmethod
+    def _violated_constraint(error: IntegrityError, column: str) -> bool:
+        """유니크 제약 위반 오류가 해당 컬럼의 제약에서 발생했는지 확인"""
+        # asyncpg 드라이버 예외는 DBAPI 어댑터 예외의 __cause__ 에 연결됨
+        cause = getattr(error.orig, "__cause__", None)
+        constraint_name = getattr(cause, "constraint_name", None)
+        if constraint_name:
+            return column in constraint_name
+        return column in str(error.orig)
+    
+    async def authenticate_user(self, email: str, password: str) -> Optional[AuthUser]:
         """
         사용자 인증 (로그인)
         
@@ -94,44 +137,116 @@ class UserService:
             password: 패스워드
             
         Returns:
-            Optional[User]: 인증된 사용자 또는 None
+            Optional[AuthUser]: 인증된 사용자의 인증용 컬럼 (전체 User 객체가 아님)
+                또는 None (없는 계정, 비활성 계정, 패스워드 불일치)
         """
-        user = await self.get_user_by_email(email)
-        if not user:
+        user = await self.get_user_by_email_for_auth(email)
+        if not user or not user.is_active:
+            # 계정 존재 여부가 응답 시간으로 드러나지 않도록 더미 해시로 동일한 검증 수행
+            await averify_dummy_password(password)
             return None
         
-        if not verify_password(password, user.hashed_password):
+        if not await averify_password(password, user.hashed_password):
             return None
         
-        # 마지막 로그인 시간 업데이트
-        await self.update_last_login(user.id)
+        # 해싱 파라미터가 변경된 경우 새 파라미터로 재해싱
+        rehashed = password_needs_rehash(user.hashed_password)
+        if rehashed:
+            hashed_password = await aget_password_hash(password)
+            await self.db.execute(
+                update(User)
+                .where(User.id == user.id)
+                .values(hashed_password=hashed_password)
+                .execution_options(synchronize_session=False)
+            )
+            user = user._replace(hashed_password=hashed_password)
+        
+        # 마지막 로그인 시간 업데이트 (최근에 기록된 경우 로그인마다 쓰지 않도록 생략)
+        now = datetime.now(timezone.utc)
+        if user.last_login is None or now - user.last_login >= _LAST_LOGIN_UPDATE_INTERVAL:
+            user = user._replace(last_login=await self.update_last_login(user.id))
+        elif rehashed:
+            await self.db.commit()
+            invalidate_user_cache(user.id)
         
         return user
     
     async def get_user_by_id(self, user_id: UUID) -> Optional[User]:
-        """ID로 사용자 조회"""
+        """ID로 사용자 조회 (캐시 우선)"""
+        user = await get_cached_user(self.db, str(user_id))
+        if user is not None:
+            return user
+        
         result = await self.db.execute(
-            select(User)
-            .options(selectinload(User.profile))
-            .where(User.id == user_id)
+            select(User).where(User.id == user_id)
         )
-        return result.scalar_one_or_none()
+        return self._cache(result.scalar_one_or_none())
+    
+    async def get_user_by_id_for_auth(self, user_id: UUID) -> Optional[AuthUser]:
+        """
+        인증용 ID 조회 (인증용 컬럼만 담은 AuthUser 반환, User 객체 아님)
+        패스워드 해시/활성 상태는 항상 DB 에서 읽음 (캐시는 워커별이라 다른 워커의
+        패스워드 변경/비활성화가 TTL 동안 반영되지 않으므로 사용하지 않음)
+        """
+        result = await self.db.execute(select(*_AUTH_COLUMNS).where(User.id == user_id))
+        row = result.one_or_none()
+        return AuthUser(*row) if row is not None else None
     
     async def get_user_by_email(self, email: str) -> Optional[User]:
-        """이메일로 사용자 조회"""
+        """이메일로 사용자 조회 (캐시 우선)"""
+        email = email.lower()
+        user = await get_cached_user(self.db, email=email)
+        if user is not None:
+            return user
+        
         result = await self.db.execute(
-            select(User)
-            .options(selectinload(User.profile))
-            .where(User.email == email)
+            select(User).where(func.lower(User.email) == email)
         )
-        return result.scalar_one_or_none()
+        return self._cache(result.scalar_one_or_none())
+    
+    async def get_user_by_email_for_auth(self, email: str) -> Optional[AuthUser]:
+        """
+        인증용 이메일 조회 (인증용 컬럼만 담은 AuthUser 반환, User 객체 아님)
+        패스워드 해시/활성 상태는 항상 DB 에서 읽음 (캐시 미사용, get_user_by_id_for_auth 참고)
+        """
+        result = await self.db.execute(
+            select(*_AUTH_COLUMNS).where(func.lower(User.email) == email.lower())
+        )
+        row = result.one_or_none()
+        return AuthUser(*row) if row is not None else None
     
     async def get_user_by_username(self, username: str) -> Optional[User]:
-        """사용자명으로 사용자 조회"""
+        """사용자명으로 사용자 조회 (캐시 우선)"""
+        username = username.lower()
+        user = await get_cached_user(self.db, username=username)
+        if user is not None:
+            return user
+        
         result = await self.db.execute(
-            select(User).where(User.username == username)
+            select(User).where(func.lower(User.username) == username)
         )
-        return result.scalar_one_or_none()
+        return self._cache(result.scalar_one_or_none())
+    
+    async def email_exists(self, email: str) -> bool:
+        """이메일 사용 여부 확인 (ID 컬럼만 조회, ORM 객체 생성 없음)"""
+        return (
+            await self.db.scalar(select(User.id).where(func.lower(User.email) == email.lower()).limit(1))
+        ) is not None
+    
+    async def username_exists(self, username: str) -> bool:
+        """사용자명 사용 여부 확인 (ID 컬럼만 조회, ORM 객체 생성 없음)"""
+        return (
+            await self.db.scalar(
+                select(User.id).where(func.lower(User.username) == username.lower()).limit(1)
+            )
+        ) is not None
+    
+    @staticmethod
+    def _cache(user: Optional[User]) -> Optional[User]:
+        """조회된 사용자를 캐시에 저장하고 그대로 반환"""
+        if user is not None:
+            cache_user(user)
+        return user
     
     async def update_user(self, user_id: UUID, user_data: UserUpdate) -> Optional[User]:
         """
@@ -153,16 +268,18 @@ class UserService:
         
         # 이메일 변경 시 중복 확인
         if user_data.email and user_data.email != user.email:
-            existing_user = await self.get_user_by_email(user_data.email)
-            if existing_user:
+            if await self.email_exists(user_data.email):
                 raise ValueError("이미 등록된 이메일입니다")
             update_data["email"] = user_data.email
             update_data["is_verified"] = False  # 이메일 변경 시 재인증 필요
         
         # 사용자명 변경 시 중복 확인
         if user_data.username and user_data.username != user.username:
-            existing_username = await self.get_user_by_username(user_data.username)
-            if existing_username:
+            # 대소문자만 바꾸는 경우는 자기 자신과 충돌하므로 중복 확인 생략
+            if (
+                user_data.username.lower() != user.username.lower()
+                and await self.username_exists(user_data.username)
+            ):
                 raise ValueError("이미 사용 중인 사용자명입니다")
             update_data["username"] = user_data.username
         
@@ -170,14 +287,19 @@ class UserService:
             update_data["full_name"] = user_data.full_name
         
         if update_data:
-            update_data["updated_at"] = datetime.utcnow()
-            await self.db.execute(
-                update(User).where(User.id == user_id).values(**update_data)
+            # UPDATE ... RETURNING 으로 갱신된 행을 바로 받아 재조회 생략
+            # (updated_at 은 컬럼의 onupdate 로 DB 의 NOW() 가 설정됨)
+            result = await self.db.execute(
+                update(User)
+                .where(User.id == user_id)
+                .values(**update_data)
+                .returning(User)
+                .options(_RETURNING_PROFILE_LOAD_OPTION),
+                execution_options={"populate_existing": True}
             )
+            user = result.scalar_one_or_none()
             await self.db.commit()
-            
-            # 업데이트된 사용자 정보 반환
-            return await self.get_user_by_id(user_id)
+            invalidate_user_cache(user_id)
         
         return user
     
@@ -193,69 +315,92 @@ class UserService:
         Returns:
             bool: 변경 성공 여부
         """
-        user = await self.get_user_by_id(user_id)
+        user = await self.get_user_by_id_for_auth(user_id)
         if not user:
             return False
         
         # 기존 패스워드 확인
-        if not verify_password(old_password, user.hashed_password):
+        if not await averify_password(old_password, user.hashed_password):
             raise ValueError("기존 패스워드가 일치하지 않습니다")
         
         # 새 패스워드 강도 검증
         if not validate_password_strength(new_password):
-            raise ValueError(
-                "패스워드는 최소 8자 이상이고, 대문자, 소문자, 숫자를 포함해야 합니다"
-            )
+            raise ValueError(_PASSWORD_STRENGTH_MESSAGE)
         
         # 패스워드 해싱 및 업데이트
-        hashed_password = get_password_hash(new_password)
+        hashed_password = await aget_password_hash(new_password)
         await self.db.execute(
             update(User)
             .where(User.id == user_id)
-            .values(hashed_password=hashed_password, updated_at=datetime.utcnow())
+            .values(hashed_password=hashed_password)
         )
         await self.db.commit()
+        invalidate_user_cache(user_id)
         
         return True
     
-    async def update_last_login(self, user_id: UUID) -> None:
-        """마지막 로그인 시간 업데이트"""
-        await self.db.execute(
+    async def update_last_login(self, user_id: UUID) -> Optional[datetime]:
+        """
+        마지막 로그인 시간 업데이트
+        
+        Args:
+            user_id: 사용자 ID
+            
+        Returns:
+            Optional[datetime]: DB 에 기록된 로그인 시간 (사용자가 없으면 None)
+        """
+        # SQL 표현식 값은 세션 내 객체에 반영할 수 없어 기본 동기화 시 속성이 만료되므로
+        # (비동기 세션에서는 만료된 속성 접근 시 오류) 동기화를 끄고 RETURNING 값을 돌려줌
+        result = await self.db.execute(
             update(User)
             .where(User.id == user_id)
-            .values(last_login=datetime.utcnow())
+            .values(last_login=func.now())
+            .returning(User.last_login)
+            .execution_options(synchronize_session=False)
         )
+        last_login = result.scalar_one_or_none()
         await self.db.commit()
+        invalidate_user_cache(user_id)
+        return last_login
     
     async def deactivate_user(self, user_id: UUID) -> bool:
         """사용자 비활성화"""
-        await self.db.execute(
+        result = await self.db.execute(
             update(User)
             .where(User.id == user_id)
-            .values(is_active=False, updated_at=datetime.utcnow())
+            .values(is_active=False)
+            .returning(User.id)
         )
+        updated = result.scalar_one_or_none() is not None
         await self.db.commit()
-        return True
+        invalidate_user_cache(user_id)
+        return updated
     
     async def activate_user(self, user_id: UUID) -> bool:
         """사용자 활성화"""
-        await self.db.execute(
+        result = await self.db.execute(
             update(User)
             .where(User.id == user_id)
-            .values(is_active=True, updated_at=datetime.utcnow())
+            .values(is_active=True)
+            .returning(User.id)
         )
+        updated = result.scalar_one_or_none() is not None
         await self.db.commit()
-        return True
+        invalidate_user_cache(user_id)
+        return updated
     
     async def verify_email(self, user_id: UUID) -> bool:
         """이메일 인증 완료 처리"""
-        await self.db.execute(
+        result = await self.db.execute(
             update(User)
             .where(User.id == user_id)
-            .values(is_verified=True, updated_at=datetime.utcnow())
+            .values(is_verified=True)
+            .returning(User.id)
         )
+        updated = result.scalar_one_or_none() is not None
         await self.db.commit()
-        return True
+        invalidate_user_cache(user_id)
+        return updated
     
     async def update_profile(self, user_id: UUID, profile_data: UserProfileUpdate) -> Optional[UserProfile]:
         """
@@ -268,51 +413,35 @@ class UserService:
         Returns:
             Optional[UserProfile]: 업데이트된 프로필 또는 None
         """
-        # 기존 프로필 조회
-        result = await self.db.execute(
-            select(UserProfile).where(UserProfile.user_id == user_id)
-        )
-        profile = result.scalar_one_or_none()
-        
-        if not profile:
-            return None
-        
-        update_data = {}
-        
-        if profile_data.bio is not None:
-            update_data["bio"] = profile_data.bio
-        
-        if profile_data.avatar_url is not None:
-            update_data["avatar_url"] = profile_data.avatar_url
-        
-        if profile_data.timezone is not None:
-            update_data["timezone"] = profile_data.timezone
-        
-        if profile_data.language is not None:
-            update_data["language"] = profile_data.language
+        # 요청에 명시된 필드만 변경 (None 은 변경하지 않음)
+        update_data = profile_data.model_dump(exclude_unset=True, exclude_none=True)
         
-        if profile_data.preferences is not None:
-            update_data["preferences"] = profile_data.preferences
-        
-        if profile_data.settings is not None:
-            update_data["settings"] = profile_data.settings
-        
-        if update_data:
-            update_data["updated_at"] = datetime.utcnow()
-            await self.db.execute(
-                update(UserProfile)
-                .where(UserProfile.user_id == user_id)
-                .values(**update_data)
+        if not update_data:
+            result = await self.db.execute(
+                select(UserProfile).where(UserProfile.user_id == user_id)
             )
-            await self.db.commit()
+            return result.scalar_one_or_none()
         
-        # 업데이트된 프로필 반환
+        # 사전 조회 없이 UPDATE ... RETURNING 한 번으로 갱신 (프로필이 없으면 None)
         result = await self.db.execute(
-            select(UserProfile).where(UserProfile.user_id == user_id)
+            update(UserProfile)
+            .where(UserProfile.user_id == user_id)
+            .values(**update_data)
+            .returning(UserProfile),
+            execution_options={"populate_existing": True}
         )
-        return result.scalar_one_or_none()
+        profile = result.scalar_one_or_none()
+        await self.db.commit()
+        
+        if profile is not None:
+            invalidate_user_cache(user_id)
+        
+        return profile
 
 
-def get_user_service(db: AsyncSession = None) -> UserService:
-    """UserService 인스턴스 반환 (의존성 주입용)"""
+def get_user_service(db: AsyncSession = Depends(get_db)) -> UserService:
+    """
+    UserService 인스턴스 반환 (의존성 주입용)
+    세션은 get_db 가 공유 엔진의 커넥션 풀에서 가져오며, 같은 요청의 다른 의존성과 공유됨
+    """
     return UserService(db)
@@ -11,8 +11,8 @@ CREATE EXTENSION IF NOT EXISTS "pgcrypto";
 -- 사용자 테이블
 CREATE TABLE IF NOT EXISTS users (
     id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-    email VARCHAR(255) UNIQUE NOT NULL,
-    username VARCHAR(100) UNIQUE NOT NULL,
+    email VARCHAR(255) NOT NULL,
+    username VARCHAR(100) NOT NULL,
     hashed_password VARCHAR(255) NOT NULL,
     full_name VARCHAR(255),
     is_active BOOLEAN DEFAULT true,
@@ -28,8 +28,8 @@ CREATE TABLE IF NOT EXISTS user_profiles (
     user_id UUID REFERENCES users(id) ON DELETE CASCADE,
     avatar_url VARCHAR(500),
     bio TEXT,
-    preferences JSONB DEFAULT '{}',
-    settings JSONB DEFAULT '{}',
+    preferences JSONB NOT NULL DEFAULT '{}',
+    settings JSONB NOT NULL DEFAULT '{}',
     timezone VARCHAR(50) DEFAULT 'UTC',
     language VARCHAR(10) DEFAULT 'ko',
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
@@ -38,7 +38,7 @@ CREATE TABLE IF NOT EXISTS user_profiles (
 
 -- 채팅 세션 테이블
 CREATE TABLE IF NOT EXISTS chat_sessions (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
     user_id UUID REFERENCES users(id) ON DELETE CASCADE,
     title VARCHAR(255),
     is_active BOOLEAN DEFAULT true,
@@ -49,21 +49,21 @@ CREATE TABLE IF NOT EXISTS chat_sessions (
 
 -- 채팅 메시지 테이블
 CREATE TABLE IF NOT EXISTS chat_messages (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
     session_id UUID REFERENCES chat_sessions(id) ON DELETE CASCADE,
     user_id UUID REFERENCES users(id) ON DELETE CASCADE,
     message_type VARCHAR(20) NOT NULL CHECK (message_type IN ('user', 'assistant', 'system')),
     content TEXT NOT NULL,
-    message_metadata JSONB DEFAULT '{}',
+    message_metadata JSONB NOT NULL DEFAULT '{}',
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     vector_id VARCHAR(255) -- Milvus 벡터 ID 참조용
 );
 
 -- 리프레시 토큰 테이블
 CREATE TABLE IF NOT EXISTS refresh_tokens (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
     user_id UUID REFERENCES users(id) ON DELETE CASCADE,
-    token_hash VARCHAR(255) NOT NULL,
+    token_hash BYTEA NOT NULL UNIQUE,  -- SHA-256 원시 바이트
     expires_at TIMESTAMP WITH TIME ZONE NOT NULL,
     is_revoked BOOLEAN DEFAULT false,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
@@ -71,13 +71,16 @@ CREATE TABLE IF NOT EXISTS refresh_tokens (
 );
 
 -- 인덱스 생성
-CREATE INDEX IF NOT EXISTS idx_users_email ON users(email);
-CREATE INDEX IF NOT EXISTS idx_users_username ON users(username);
+-- 대소문자 구분 없는 이메일/사용자명 유일성 보장 및 lower() 조회용 함수 인덱스
+CREATE UNIQUE INDEX IF NOT EXISTS idx_users_lower_email ON users(lower(email));
+CREATE UNIQUE INDEX IF NOT EXISTS idx_users_lower_username ON users(lower(username));
 CREATE INDEX IF NOT EXISTS idx_users_is_active ON users(is_active);
-CREATE INDEX IF NOT EXISTS idx_chat_messages_session_id ON chat_messages(session_id);
-CREATE INDEX IF NOT EXISTS idx_chat_messages_user_id ON chat_messages(user_id);
+CREATE INDEX IF NOT EXISTS idx_user_profiles_preferences_gin ON user_profiles USING GIN (preferences);
+-- 세션/사용자별 메시지를 시간순으로 조회하는 패턴에 맞춘 복합 인덱스 (선두 컬럼 단독 조회도 처리)
+CREATE INDEX IF NOT EXISTS idx_chat_messages_session_created ON chat_messages(session_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_chat_messages_user_created ON chat_messages(user_id, created_at);
 CREATE INDEX IF NOT EXISTS idx_chat_messages_created_at ON chat_messages(created_at);
-CREATE INDEX IF NOT EXISTS idx_refresh_tokens_user_id ON refresh_tokens(user_id);
+CREATE INDEX IF NOT EXISTS idx_refresh_tokens_user_active ON refresh_tokens(user_id, is_revoked, expires_at);
 CREATE INDEX IF NOT EXISTS idx_refresh_tokens_expires_at ON refresh_tokens(expires_at);
 
 -- 업데이트 트리거 함수
@@ -100,10 +103,10 @@ INSERT INTO users (email, username, hashed_password, full_name, is_verified)
 VALUES (
     'admin@friendai.com', 
     'admin', 
-    '$2b$12$LQv3c1yqBWVHxkd0LHAkCOYz6TtxMQJqhN8/jKTgKq5zFD5t0aKpG', -- password: admin123
+    '$argon2id$v=19$m=19456,t=2,p=1$tyEwl5J/apIDPpb6wygdrA$1pfgbPRqAz/kqhwKmeFw7rT+UcruTCrIeSUHMPAHkbw', -- password: admin123
     'Admin User',
     true
-) ON CONFLICT (email) DO NOTHING;
+) ON CONFLICT ((lower(email))) DO NOTHING;
 
 -- 테이블 정보 출력
 \dt
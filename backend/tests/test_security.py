@@ -0,0 +1,122 @@
+"""
+Security Utility Tests
+JWT HS256 fast path 가 PyJWT(jwt.decode) 와 같은 결과를 내는지 검증
+"""
+
+import base64
+from datetime import datetime, timedelta, timezone
+
+import jwt
+import orjson
+import pytest
+from jwt import PyJWTError
+
+from app.core.config import settings
+from app.core.security import (
+    _HS256_HEADER_B64, _decode_token, create_access_token, create_refresh_token, verify_token
+)
+
+
+def _reference_decode(token: str, token_type: str):
+    """비교 기준: PyJWT 로 검증한 뒤 토큰 타입 확인"""
+    try:
+        payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
+    except PyJWTError:
+        return None
+    if payload.get("type") != token_type:
+        return None
+    return payload
+
+
+def _b64url(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _encode(claims: dict, key: str = settings.JWT_SECRET_KEY, algorithm: str = "HS256") -> str:
+    return jwt.encode(claims, key, algorithm=algorithm)
+
+
+def _claims(**overrides) -> dict:
+    now = datetime.now(timezone.utc)
+    claims = {"sub": "user-1", "type": "access", "iat": now, "exp": now + timedelta(minutes=5)}
+    claims.update(overrides)
+    return claims
+
+
+def _with_payload(token: str, payload: dict) -> str:
+    """서명은 그대로 두고 페이로드만 교체한 위조 토큰"""
+    header, _, signature = token.split(".")
+    return ".".join([header, _b64url(orjson.dumps(payload)), signature])
+
+
+def _cases():
+    now = datetime.now(timezone.utc)
+    valid = _encode(_claims())
+    return {
+        "valid_access": (valid, "access"),
+        "valid_refresh": (create_refresh_token({"sub": "user-1"}), "refresh"),
+        "access_as_refresh": (valid, "refresh"),
+        "refresh_as_access": (create_refresh_token({"sub": "user-1"}), "access"),
+        "missing_type": (_encode({"sub": "user-1", "exp": now + timedelta(minutes=5)}), "access"),
+        "wrong_key": (_encode(_claims(), key="another-secret"), "access"),
+        "tampered_payload": (
+            _with_payload(valid, {"sub": "admin", "type": "access", "exp": 4102444800}), "access"
+        ),
+        "truncated_signature": (valid[:-2], "access"),
+        "expired": (_encode(_claims(exp=now - timedelta(seconds=1))), "access"),
+        "future_nbf": (_encode(_claims(nbf=now + timedelta(minutes=1))), "access"),
+        "past_nbf": (_encode(_claims(nbf=now - timedelta(minutes=1))), "access"),
+        "non_numeric_exp": (_encode(_claims(exp="soon")), "access"),
+        "no_exp": (_encode({"sub": "user-1", "type": "access"}), "access"),
+        "hs512_header": (_encode(_claims(), algorithm="HS512"), "access"),
+        "none_alg": (jwt.encode(_claims(), None, algorithm="none"), "access"),
+        "garbage": ("not.a.token", "access"),
+    }
+
+
+CASES = _cases()
+
+
+def test_pyjwt_tokens_use_fast_path_header():
+    """PyJWT 가 발급한 HS256 토큰은 fast path 헤더와 일치해야 함 (fast path 가 실제로 검증됨)"""
+    token = create_access_token({"sub": "user-1"})
+    assert token.encode().startswith(_HS256_HEADER_B64 + b".")
+
+
+@pytest.mark.parametrize("name", sorted(CASES))
+def test_decode_matches_pyjwt(name):
+    """fast path 결과가 PyJWT 검증 결과와 동일"""
+    token, token_type = CASES[name]
+    assert _decode_token(token, token_type) == _reference_decode(token, token_type)
+
+
+@pytest.mark.parametrize("name", ["valid_access", "valid_refresh", "past_nbf", "no_exp"])
+def test_valid_tokens_are_accepted(name):
+    token, token_type = CASES[name]
+    payload = _decode_token(token, token_type)
+    assert payload is not None
+    assert payload["sub"] == "user-1"
+
+
+@pytest.mark.parametrize("name", [
+    "access_as_refresh", "refresh_as_access", "missing_type", "wrong_key", "tampered_payload",
+    "truncated_signature", "expired", "future_nbf", "non_numeric_exp", "hs512_header",
+    "none_alg", "garbage",
+])
+def test_invalid_tokens_are_rejected(name):
+    token, token_type = CASES[name]
+    assert _decode_token(token, token_type) is None
+
+
+def test_verify_token_cache_does_not_accept_tampered_token():
+    """정상 토큰이 캐시된 뒤에도 위조 토큰은 캐시 항목과 무관하게 거부"""
+    token = create_access_token({"sub": "user-1"})
+    assert verify_token(token) is not None
+    forged = _with_payload(token, {"sub": "admin", "type": "access", "exp": 4102444800})
+    assert verify_token(forged) is None
+
+
+def test_verify_token_refresh_type():
+    token = create_refresh_token({"sub": "user-1"})
+    assert verify_token(token, token_type="refresh")["sub"] == "user-1"
+    assert verify_token(token) is None